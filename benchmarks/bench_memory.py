@@ -0,0 +1,98 @@
+# benchmarks/bench_memory.py
+"""Peak memory of a 100k-row catalog, accumulated versus streamed.
+
+The fixture page lives on the "browser" side: rows are generated on
+demand when the row-range script asks for them, like a real DOM.
+
+Run with: python -m benchmarks.bench_memory
+"""
+
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+from src.builder.pool import ScrapePool
+from src.builder.profiles import default_extractor
+from src.builder.scraper import PageObject
+
+ROWS = 100_000
+CHUNK_SIZE = 500
+QUEUE_SIZE = 4
+
+
+def fixture_row(index: int) -> list:
+    return [
+        [
+            str(index),
+            f"Product {index}",
+            "Apparel",
+            f"${index % 500}.99",
+            f"In Stock ({index % 40 + 1})",
+            "View Details",
+        ],
+        f"https://example.com/product/{index}",
+    ]
+
+
+class FixtureDriver(MagicMock):
+    def execute_script(self, script, *args):
+        if script == default_extractor().row_range_script:
+            start, end = args
+            return [
+                ROWS,
+                [fixture_row(i) for i in range(start, min(end, ROWS))],
+            ]
+        return None
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def page_object() -> PageObject:
+    with (
+        patch("src.builder.scraper.webdriver.Remote", FixtureDriver),
+        patch("src.builder.scraper.WebDriverWait"),
+    ):
+        page = PageObject(category="Apparel")
+    page.prepare_page = lambda: True
+    page.expected_count = ROWS
+    return page
+
+
+def accumulated() -> int:
+    products = []
+    page_object().stream_products(products.extend, chunk_size=CHUNK_SIZE)
+    return len(products)
+
+
+def streamed(samples: list) -> int:
+    pool = ScrapePool(size=1, category="Apparel", page_object=page_object())
+    count = 0
+    for chunk in pool.stream(maxsize=QUEUE_SIZE, chunk_size=CHUNK_SIZE):
+        count += len(chunk)
+        if count % (ROWS // 10) == 0:
+            samples.append(rss_kb())
+    return count
+
+
+def measure(name, func, *args):
+    tracemalloc.start()
+    count = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {count} rows, peak {peak / 2**20:7.1f} MiB")
+
+
+def main():
+    samples = []
+    measure("streamed", streamed, samples)
+    print("RSS every 10k rows (KiB):", " ".join(map(str, samples)))
+    measure("accumulated", accumulated)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_serialization.py
+"""Compare the /scrape serialization paths on a large category.
+
+Run with: python -m benchmarks.bench_serialization
+"""
+
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.models.product import Product, dump_products
+
+PRODUCTS = 10_000
+ROUNDS = 10
+
+
+def build_products(count: int = PRODUCTS) -> list:
+    return [
+        Product(
+            title=f"Product {index}",
+            price=index * 1.25,
+            link=f"https://example.com/product/{index}",
+            stock_status="In Stock" if index % 3 else "Out of Stock",
+            stock_quantity=index % 50,
+            total=count,
+        )
+        for index in range(count)
+    ]
+
+
+def main():
+    products = build_products()
+
+    def jsonable():
+        return JSONResponse(content=jsonable_encoder(products)).body
+
+    def adapter():
+        return dump_products(products)
+
+    assert jsonable()
+    assert adapter()
+    for name, func in (
+        ("jsonable_encoder + JSONResponse", jsonable),
+        ("TypeAdapter.dump_json", adapter),
+    ):
+        seconds = min(timeit.repeat(func, number=1, repeat=ROUNDS))
+        print(f"{name:<34} {seconds * 1000:8.2f} ms / {PRODUCTS} products")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# benchmarks/bench_startup.py
+"""Track the import cost of the API module with ``python -X importtime``.
+
+Run with: python -m benchmarks.bench_startup
+"""
+
+import subprocess
+import sys
+
+TARGET = "src.automation.app"
+TOP = 15
+
+
+def importtime(module: str = TARGET) -> list:
+    """Return (cumulative_us, module) pairs reported by -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return rows
+
+
+def main():
+    rows = importtime()
+    total = next(us for us, name in rows if name.strip() == TARGET)
+    print(f"import {TARGET}: {total / 1000:.1f} ms")
+    for us, name in sorted(rows, reverse=True)[:TOP]:
+        print(f"{us / 1000:10.1f} ms {name}")
+    heavy = [name for _, name in rows if name.strip() == "selenium"]
+    print(f"selenium imported at startup: {bool(heavy)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,112 @@
 # src/automation/app.py
 
-from typing import Literal
+import asyncio
+import importlib
+import logging
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Literal, Optional
 
-from fastapi import FastAPI, status
+from fastapi import FastAPI, Header, Query, Request, status
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from src.automation.export import (
+    MEDIA_TYPES,
+    UNCOMPRESSED_FORMATS,
+    export_stream,
+    format_available,
+    negotiate_encoding,
+)
+from src.automation.limits import CACHED_COST, get_rate_limiter
+from src.builder.watchdog import (
+    cleanup_orphaned_sessions,
+    get_grid_http,
+    hub_ready,
+)
+from src.config.settings import get_settings
+from src.execute.cache import PRODUCT_CACHE, CacheEntry
+from src.execute.service import ExecuteService, get_site_profile, site_key
+from src.execute.warmup import get_warmup
+from src.models.history import HISTORY_LIST_ADAPTER, ProductHistory
+from src.models.site import DEFAULT_SITE
+from src.monitoring.metrics import METRICS
+from src.storage.history import get_history_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fail fast on bad configuration or site profiles and load Selenium
+    # before the first request instead of at import time.
+    settings = get_settings()
+    importlib.import_module("src.builder.pool")
+    get_site_profile(DEFAULT_SITE)
+    if settings.cleanup_orphans and settings.hub_selenium:
+        await run_in_threadpool(remove_orphaned_sessions, settings)
+    tasks = [asyncio.create_task(get_warmup().run())]
+    if settings.session_pool_size and settings.watchdog_interval:
+        tasks.append(
+            asyncio.create_task(sweep_sessions(settings.watchdog_interval))
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await run_in_threadpool(close_resources)
+
+
+# Seconds the hub may take to answer a readiness probe, probes usually
+# time out after one second.
+HUB_CHECK_TIMEOUT = 0.8
+
+
+def remove_orphaned_sessions(settings):
+    try:
+        cleanup_orphaned_sessions(
+            get_grid_http(), settings.hub_selenium, settings.session_tag
+        )
+    except Exception as e:
+        logging.error(f"Failed to clean up orphaned grid sessions: {e}")
+
+
+def close_resources():
+    """Quit idle browser sessions and close the history log on shutdown.
+
+    Sessions left open hold grid slots until the grid's idle timeout.
+    """
+    sessions = sys.modules.get("src.builder.sessions")
+    if sessions is not None:
+        # Warmed sessions still held back by an unfinished warm-up.
+        for page_object in get_warmup().opened:
+            page_object.close()
+        if sessions.get_session_pool.cache_info().currsize:
+            sessions.get_session_pool().close()
+    if get_history_store.cache_info().currsize:
+        get_history_store().close()
+
+
+async def sweep_sessions(interval: float):
+    sessions = importlib.import_module("src.builder.sessions")
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(sessions.get_session_pool().sweep)
+        except Exception as e:
+            logging.error(f"Session sweep failed: {e}")
 
-from src.execute.service import ExecuteService
 
 app = FastAPI(
-    title="Scraper", description="Scraper automation api.", version="0.0.1"
+    title="Scraper",
+    description="Scraper automation api.",
+    version="0.0.1",
+    lifespan=lifespan,
 )
 
 FILTER_ARGUMENTS_SCRAPE = [
@@ -21,6 +118,52 @@ FILTER_ARGUMENTS_SCRAPE = [
 ]
 
 
+def products_response(entry: CacheEntry, cache: str) -> Response:
+    """Send the pre-serialized payload and headers, no per-request work."""
+    return Response(
+        content=entry.payload,
+        media_type="application/json",
+        headers={**entry.headers, "X-Cache": cache},
+    )
+
+
+def client_key(request: Request, client_id: Optional[str]) -> str:
+    if client_id:
+        return client_id
+    return request.client.host if request.client else "anonymous"
+
+
+def shed_load(
+    category: str, client: str, detail: str, serve_stale: bool = True
+) -> Response:
+    """Degrade to a stale snapshot before refusing with 429.
+
+    Streaming endpoints pass `serve_stale=False`, a snapshot is not in
+    their format.
+    """
+    stale = PRODUCT_CACHE.stale(category) if serve_stale else None
+    if stale is not None:
+        return products_response(stale, cache="stale")
+    retry_after = get_rate_limiter().retry_after(
+        client, get_settings().rate_limit_scrape_cost
+    )
+    return JSONResponse(
+        content={"detail": detail},
+        status_code=429,
+        headers={"Retry-After": str(max(int(retry_after + 0.999), 1))},
+    )
+
+
+def close_quietly(iterator):
+    close = getattr(iterator, "close", None)
+    try:
+        if close is not None:
+            close()
+    except ValueError:
+        # Still running in a worker thread, it stops on its own.
+        pass
+
+
 @app.get(
     "/scrape",
     tags=["scrape"],
@@ -41,6 +184,17 @@ FILTER_ARGUMENTS_SCRAPE = [
                     ]
                 }
             },
+            "headers": {
+                "X-Products-Parsed": {"description": "Distinct rows parsed"},
+                "X-Products-Expected": {
+                    "description": "Rows reported by #product-count"
+                },
+                "X-Products-Complete": {
+                    "description": "Whether every expected row was parsed, "
+                    "unknown when #product-count could not be read"
+                },
+                "X-Cache": {"description": "hit, miss or stale"},
+            },
         },
         404: {
             "messages": [
@@ -48,13 +202,16 @@ FILTER_ARGUMENTS_SCRAPE = [
                 {"message_id": "Product not found"},
             ]
         },
-        429: {"description": "No worker available"},
+        429: {"description": "Rate limit exceeded or no worker available"},
     },
 )
 async def scraper_products(
+    request: Request,
     category: Literal[
         "All Categories", "Apparel", "Cosmetics", "Electronics", "Home Goods"
     ],
+    x_client_id: Optional[str] = Header(None),
+    x_priority: Literal["high", "normal", "low"] = Header("normal"),
 ):
     """Get products from category"""
 
@@ -64,10 +221,34 @@ async def scraper_products(
             status_code=404,
         )
 
-    service = ExecuteService(category=category)
+    return await scrape_category(
+        category,
+        client_key(request, x_client_id),
+        x_priority,
+        lambda: ExecuteService(category=category),
+    )
+
+
+async def scrape_category(
+    key: str, client: str, priority: str, make_service
+) -> Response:
+    """Cached products under `key`, or a scrape by a new service."""
+    cached = PRODUCT_CACHE.get(key)
+    cost = (
+        CACHED_COST
+        if cached is not None
+        else get_settings().rate_limit_scrape_cost
+    )
+    if not get_rate_limiter().allow(client, cost):
+        return shed_load(key, client, "rate limit exceeded")
+
+    if cached is not None:
+        return products_response(cached, cache="hit")
+
+    service = make_service()
 
     try:
-        products = await service.run()
+        products = await service.run(priority=priority)
 
         if not products:
             return JSONResponse(
@@ -75,17 +256,359 @@ async def scraper_products(
                 status_code=404,
             )
 
-        return JSONResponse(content=jsonable_encoder(products))
+        entry = PRODUCT_CACHE.put(key, products)
+        return products_response(entry, cache="miss")
     except RuntimeError as e:
         if str(e) == "no_worker_available":
-            return JSONResponse(
-                content={"detail": "no worker available"},
-                status_code=429,
-            )
+            return shed_load(key, client, "no worker available")
         raise e
 
     finally:
-        service.close()
+        await run_in_threadpool(service.close)
+
+
+@app.get(
+    "/sites/{site}/scrape",
+    tags=["sites"],
+    responses={
+        404: {
+            "messages": [
+                {"message_id": "Site not found"},
+                {"message_id": "Category not found"},
+                {"message_id": "Product not found"},
+            ]
+        },
+        429: {"description": "Rate limit exceeded or no worker available"},
+    },
+)
+async def scrape_site(
+    request: Request,
+    site: str,
+    category: str,
+    x_client_id: Optional[str] = Header(None),
+    x_priority: Literal["high", "normal", "low"] = Header("normal"),
+):
+    """Get products from a category of a site described by a profile"""
+
+    profile = get_site_profile(site)
+    if profile is None:
+        return JSONResponse(
+            content=jsonable_encoder({"message_id": "Site not found"}),
+            status_code=404,
+        )
+    if category not in profile.categories:
+        return JSONResponse(
+            content=jsonable_encoder({"message_id": "Category not found"}),
+            status_code=404,
+        )
+
+    return await scrape_category(
+        site_key(site, category),
+        client_key(request, x_client_id),
+        x_priority,
+        lambda: ExecuteService(category=category, site=site),
+    )
+
+
+@app.get(
+    "/scrape/enriched",
+    tags=["scrape"],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Products with their detail page, one per line",
+            "content": {"application/x-ndjson": {}},
+        },
+        404: {"messages": [{"message_id": "Product not found"}]},
+        429: {"description": "Rate limit exceeded or no worker available"},
+    },
+)
+async def scraper_products_enriched(
+    request: Request,
+    category: Literal[
+        "All Categories", "Apparel", "Cosmetics", "Electronics", "Home Goods"
+    ],
+    x_client_id: Optional[str] = Header(None),
+    x_priority: Literal["high", "normal", "low"] = Header("normal"),
+):
+    """Get products from category with description, SKU and images"""
+
+    # Detail pages are always fetched, so this is never a cheap request.
+    client = client_key(request, x_client_id)
+    if not get_rate_limiter().allow(
+        client, get_settings().rate_limit_scrape_cost
+    ):
+        return shed_load(
+            category, client, "rate limit exceeded", serve_stale=False
+        )
+
+    service = ExecuteService(category=category)
+    # Even a cached listing may fall back to a browser session for pages
+    # rendered client side, admit before any session is opened.
+    try:
+        await service.acquire_worker(priority=x_priority)
+    except RuntimeError as e:
+        await run_in_threadpool(service.close)
+        if str(e) == "no_worker_available":
+            return shed_load(
+                category, client, "no worker available", serve_stale=False
+            )
+        raise e
+
+    enriched = None
+
+    async def finish():
+        if enriched is not None:
+            await run_in_threadpool(close_quietly, enriched)
+        await service.release_worker()
+        await run_in_threadpool(service.close)
+
+    cached = PRODUCT_CACHE.get(category)
+    try:
+        # Opening a session blocks, keep it off the event loop.
+        if cached is not None:
+            enriched = await run_in_threadpool(service.enrich, cached.products)
+        else:
+            # Detail pages are fetched while the listing is still read.
+            enriched = await run_in_threadpool(
+                service.enrich_stream,
+                lambda products: PRODUCT_CACHE.put(category, products),
+            )
+        first = await run_in_threadpool(next, enriched, None)
+    except Exception:
+        await finish()
+        raise
+    if first is None:
+        await finish()
+        return JSONResponse(
+            content=jsonable_encoder({"message_id": "Product not found"}),
+            status_code=404,
+        )
+
+    async def lines():
+        try:
+            yield first.model_dump_json().encode() + b"\n"
+            async for product in iterate_in_threadpool(enriched):
+                yield product.model_dump_json().encode() + b"\n"
+        finally:
+            # Also runs when the client goes away mid-stream.
+            await finish()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get(
+    "/scrape/stream",
+    tags=["scrape"],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Products one per line, read in bounded memory",
+            "content": {"application/x-ndjson": {}},
+        },
+        429: {"description": "Rate limit exceeded or no worker available"},
+    },
+)
+async def scraper_products_stream(
+    request: Request,
+    category: Literal[
+        "All Categories", "Apparel", "Cosmetics", "Electronics", "Home Goods"
+    ],
+    x_client_id: Optional[str] = Header(None),
+    x_priority: Literal["high", "normal", "low"] = Header("normal"),
+):
+    """Stream products from category for very large catalogs"""
+
+    client = client_key(request, x_client_id)
+    if not get_rate_limiter().allow(
+        client, get_settings().rate_limit_scrape_cost
+    ):
+        return shed_load(
+            category, client, "rate limit exceeded", serve_stale=False
+        )
+
+    service = ExecuteService(category=category)
+    try:
+        await service.acquire_worker(priority=x_priority)
+    except RuntimeError as e:
+        await run_in_threadpool(service.close)
+        if str(e) == "no_worker_available":
+            return shed_load(
+                category, client, "no worker available", serve_stale=False
+            )
+        raise e
+
+    try:
+        # Opening the session blocks, keep it off the event loop.
+        chunks = await run_in_threadpool(service.stream)
+    except Exception:
+        await service.release_worker()
+        await run_in_threadpool(service.close)
+        raise
+
+    async def lines():
+        try:
+            async for chunk in iterate_in_threadpool(chunks):
+                yield b"".join(
+                    product.model_dump_json().encode() + b"\n"
+                    for product in chunk
+                )
+        finally:
+            # Also runs when the client goes away mid-stream.
+            await run_in_threadpool(close_quietly, chunks)
+            await service.release_worker()
+            await run_in_threadpool(service.close)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get(
+    "/export",
+    tags=["export"],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Latest snapshot of a category, streamed",
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+        },
+        404: {"messages": [{"message_id": "Snapshot not found"}]},
+        501: {"messages": [{"message_id": "Format not available"}]},
+    },
+)
+async def export_products(
+    category: Literal[
+        "All Categories", "Apparel", "Cosmetics", "Electronics", "Home Goods"
+    ],
+    export_format: Literal[
+        "json", "columnar", "ndjson", "csv", "arrow", "parquet"
+    ] = Query("json", alias="format"),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """Export the latest scraped snapshot of a category for bulk consumers"""
+
+    if not format_available(export_format):
+        return JSONResponse(
+            content={"message_id": "Format not available"},
+            status_code=501,
+        )
+
+    entry = PRODUCT_CACHE.latest(category)
+    if entry is None:
+        return JSONResponse(
+            content=jsonable_encoder({"message_id": "Snapshot not found"}),
+            status_code=404,
+        )
+
+    encoding = (
+        None
+        if export_format in UNCOMPRESSED_FORMATS
+        else negotiate_encoding(accept_encoding)
+    )
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    if export_format in ("csv", "arrow", "parquet"):
+        filename = category.lower().replace(" ", "-")
+        headers["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{export_format}"'
+        )
+
+    return StreamingResponse(
+        export_stream(entry.products, export_format, encoding),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+@app.get(
+    "/history/product",
+    tags=["history"],
+    response_model=ProductHistory,
+    responses={404: {"messages": [{"message_id": "Product not found"}]}},
+)
+def product_history(
+    link: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    interval: Optional[float] = Query(None, gt=0),
+):
+    """Price and stock observations of one product, optionally downsampled
+    to the last observation of every `interval` seconds"""
+
+    # A plain def runs in the threadpool, loading and walking the history
+    # blocks.
+
+    history = get_history_store().product_history(link, start, end, interval)
+    if history is None:
+        return JSONResponse(
+            content=jsonable_encoder({"message_id": "Product not found"}),
+            status_code=404,
+        )
+    return Response(
+        content=history.model_dump_json(), media_type="application/json"
+    )
+
+
+@app.get(
+    "/history/category",
+    tags=["history"],
+    response_model=list[ProductHistory],
+)
+def category_history(
+    category: Literal[
+        "All Categories", "Apparel", "Cosmetics", "Electronics", "Home Goods"
+    ],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    interval: Optional[float] = Query(None, gt=0),
+):
+    """Price and stock observations of every product seen in a category"""
+
+    histories = get_history_store().category_history(
+        category, start, end, interval
+    )
+    return Response(
+        content=HISTORY_LIST_ADAPTER.dump_json(histories),
+        media_type="application/json",
+    )
+
+
+@app.get("/healthz", tags=["monitoring"])
+async def healthz():
+    """The process is up and serving requests"""
+
+    return {"status": "ok"}
+
+
+@app.get(
+    "/readyz",
+    tags=["monitoring"],
+    responses={503: {"description": "Not ready to take traffic yet"}},
+)
+async def readyz():
+    """Hub reachable, warm sessions opened and warm categories cached"""
+
+    hub_selenium = get_settings().hub_selenium
+    warmup = get_warmup()
+    checks = {
+        "hub": hub_selenium is not None
+        and await run_in_threadpool(
+            hub_ready, get_grid_http(), hub_selenium, HUB_CHECK_TIMEOUT
+        ),
+        "sessions": warmup.sessions_ready(),
+        "cache": warmup.cache_primed(),
+    }
+    ready = all(checks.values())
+    return JSONResponse(
+        content={"ready": ready, "checks": checks},
+        status_code=200 if ready else 503,
+    )
+
+
+@app.get("/metrics", tags=["monitoring"], response_class=PlainTextResponse)
+async def metrics():
+    """Counters in the Prometheus text format, including session recycles"""
+
+    return PlainTextResponse(
+        METRICS.render(), media_type="text/plain; version=0.0.4"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+# src/automation/export.py
+
+import csv
+import importlib
+import io
+import zlib
+from typing import Iterable, Iterator, List, Optional
+
+from pydantic_core import to_json
+
+from src.models.product import PRODUCT_LIST_ADAPTER, Product
+
+EXPORT_FORMATS = ["json", "columnar", "ndjson", "csv", "arrow", "parquet"]
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "columnar": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Formats that are already compressed or binary are sent as-is.
+UNCOMPRESSED_FORMATS = {"arrow", "parquet"}
+
+FIELDS = list(Product.model_fields)
+
+# Rows encoded per chunk when streaming, bounds the memory of one write.
+CHUNK_ROWS = 1000
+
+# Preferred order when the client accepts several encodings equally.
+ENCODING_PREFERENCE = ["zstd", "br", "gzip"]
+
+OPTIONAL_ENCODERS = {"zstd": "zstandard", "br": "brotli"}
+
+
+def optional_module(name: str):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def available_encodings() -> List[str]:
+    return [
+        encoding
+        for encoding in ENCODING_PREFERENCE
+        if encoding not in OPTIONAL_ENCODERS
+        or optional_module(OPTIONAL_ENCODERS[encoding]) is not None
+    ]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    candidates = [
+        encoding
+        for encoding in available_encodings()
+        if weights.get(encoding, weights.get("*", 0.0)) > 0
+    ]
+    if not candidates:
+        return None
+    return max(
+        candidates,
+        key=lambda encoding: weights.get(encoding, weights.get("*", 0.0)),
+    )
+
+
+def chunks(products: List[Product]) -> Iterator[List[Product]]:
+    for start in range(0, len(products), CHUNK_ROWS):
+        yield products[start : start + CHUNK_ROWS]
+
+
+def iter_json(products: List[Product]) -> Iterator[bytes]:
+    yield b"["
+    for index, chunk in enumerate(chunks(products)):
+        if index:
+            yield b","
+        # Drop the brackets of each encoded chunk to splice them together.
+        yield PRODUCT_LIST_ADAPTER.dump_json(chunk)[1:-1]
+    yield b"]"
+
+
+def iter_ndjson(products: List[Product]) -> Iterator[bytes]:
+    for chunk in chunks(products):
+        yield b"".join(
+            product.model_dump_json().encode() + b"\n" for product in chunk
+        )
+
+
+def iter_columnar(products: List[Product]) -> Iterator[bytes]:
+    """One array per field, the field names are not repeated per row."""
+    yield b"{"
+    for index, name in enumerate(FIELDS):
+        if index:
+            yield b","
+        yield to_json(name) + b":"
+        yield to_json([getattr(product, name) for product in products])
+    yield b"}"
+
+
+def iter_csv(products: List[Product]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for chunk in chunks(products):
+        writer.writerows(
+            [getattr(product, name) for name in FIELDS] for product in chunk
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def arrow_table(products: List[Product]):
+    pyarrow = importlib.import_module("pyarrow")
+    return pyarrow.table(
+        {
+            name: [getattr(product, name) for product in products]
+            for name in FIELDS
+        }
+    )
+
+
+def iter_arrow(products: List[Product]) -> Iterator[bytes]:
+    pyarrow = importlib.import_module("pyarrow")
+    table = arrow_table(products)
+    sink = io.BytesIO()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=CHUNK_ROWS):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()
+
+
+def iter_parquet(products: List[Product]) -> Iterator[bytes]:
+    parquet = importlib.import_module("pyarrow.parquet")
+    sink = io.BytesIO()
+    parquet.write_table(arrow_table(products), sink)
+    yield sink.getvalue()
+
+
+ENCODERS = {
+    "json": iter_json,
+    "columnar": iter_columnar,
+    "ndjson": iter_ndjson,
+    "csv": iter_csv,
+    "arrow": iter_arrow,
+    "parquet": iter_parquet,
+}
+
+
+def format_available(export_format: str) -> bool:
+    if export_format in ("arrow", "parquet"):
+        return optional_module("pyarrow") is not None
+    return export_format in ENCODERS
+
+
+def compressor(encoding: str):
+    if encoding == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if encoding == "br":
+        return optional_module("brotli").Compressor()
+    if encoding == "zstd":
+        return optional_module("zstandard").ZstdCompressor().compressobj()
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def compress_stream(
+    stream: Iterable[bytes], encoding: Optional[str]
+) -> Iterator[bytes]:
+    if encoding is None:
+        yield from stream
+        return
+    compress = compressor(encoding)
+    for data in stream:
+        # brotli exposes process(), zlib and zstandard compress()
+        output = (
+            compress.process(data)
+            if encoding == "br"
+            else compress.compress(data)
+        )
+        if output:
+            yield output
+    yield compress.finish() if encoding == "br" else compress.flush()
+
+
+def export_stream(
+    products: List[Product], export_format: str, encoding: Optional[str]
+) -> Iterator[bytes]:
+    return compress_stream(ENCODERS[export_format](products), encoding)
@@ -0,0 +1,84 @@
+# src/automation/limits.py
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from src.config.settings import get_settings
+
+# Cached answers are cheap, a fresh browser scrape costs much more.
+CACHED_COST = 1
+
+# Client buckets kept in memory, the least recently seen are dropped.
+MAX_CLIENTS = 10_000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def take(self, cost: float) -> bool:
+        self.refill()
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+    def retry_after(self, cost: float) -> float:
+        self.refill()
+        missing = max(cost - self.tokens, 0)
+        return missing / self.rate if self.rate else 0
+
+
+class RateLimiter:
+    """Token bucket per client, disabled when the rate is 0."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def bucket(self, client_id: str) -> TokenBucket:
+        bucket = self.buckets.pop(client_id, None)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+        self.buckets[client_id] = bucket
+        if len(self.buckets) > MAX_CLIENTS:
+            self.buckets.popitem(last=False)
+        return bucket
+
+    def allow(self, client_id: str, cost: float) -> bool:
+        if not self.enabled:
+            return True
+        with self.lock:
+            return self.bucket(client_id).take(cost)
+
+    def retry_after(self, client_id: str, cost: float) -> float:
+        if not self.enabled:
+            return 0
+        with self.lock:
+            return self.bucket(client_id).retry_after(cost)
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter:
+    settings = get_settings()
+    return RateLimiter(
+        rate=settings.rate_limit_rate, burst=settings.rate_limit_burst
+    )
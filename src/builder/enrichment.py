@@ -0,0 +1,304 @@
+# src/builder/enrichment.py
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, Iterator, Optional
+from urllib.parse import urljoin, urlsplit
+
+from src.config.settings import get_settings
+from src.models.product import EnrichedProduct, Product, ProductDetail
+
+logging.basicConfig(level=logging.INFO)
+
+HTTP_OK = 200
+HTTP_NOT_MODIFIED = 304
+
+# Seconds to wait for one static detail page.
+DETAIL_TIMEOUT = 10
+
+SKU_PATTERN = re.compile(r"\bSKU\s*[:#]?\s*([\w-]+)", re.IGNORECASE)
+
+# Elements without an end tag, they never open a nesting level.
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "source",
+    "track",
+    "wbr",
+}
+
+
+class DetailParser(HTMLParser):
+    """Pull description, SKU and images out of a static detail page."""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url
+        self.description = ""
+        self.sku = ""
+        self.images = []
+        self.capture = None
+        self.depth = 0
+        self.text = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        marker = f"{attrs.get('id', '')} {attrs.get('class', '')}".lower()
+        if tag == "meta" and attrs.get("name") == "description":
+            self.description = self.description or attrs.get("content", "")
+        elif tag == "img" and attrs.get("src"):
+            self.images.append(urljoin(self.base_url, attrs["src"]))
+        if tag in VOID_ELEMENTS:
+            # `<br>` and friends still separate words.
+            if self.capture is not None:
+                self.text.append(" ")
+            return
+        if self.capture is None and "description" in marker:
+            self.capture, self.depth, self.text = "description", 0, []
+        elif self.capture is None and "sku" in marker:
+            self.capture, self.depth, self.text = "sku", 0, []
+        if self.capture is not None:
+            self.depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        # `<br/>` opens nothing, `<div/>` opens and closes a level.
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.capture is None or tag in VOID_ELEMENTS:
+            return
+        self.depth -= 1
+        if self.depth == 0:
+            value = " ".join("".join(self.text).split())
+            if self.capture == "sku":
+                match = SKU_PATTERN.search(value)
+                self.sku = match.group(1) if match else value
+            else:
+                self.description = value
+            self.capture = None
+
+    def handle_data(self, data):
+        if self.capture is not None:
+            self.text.append(data)
+        elif not self.sku:
+            match = SKU_PATTERN.search(data)
+            if match:
+                self.sku = match.group(1)
+
+
+def parse_detail(html: str, base_url: str) -> ProductDetail:
+    parser = DetailParser(base_url)
+    parser.feed(html)
+    parser.close()
+    return ProductDetail(
+        description=parser.description,
+        sku=parser.sku,
+        images=list(dict.fromkeys(parser.images)),
+    )
+
+
+def is_empty(detail: ProductDetail) -> bool:
+    return not (detail.description or detail.sku or detail.images)
+
+
+@dataclass
+class CachedDetail:
+    detail: ProductDetail
+    content_hash: str
+    etag: Optional[str]
+    fetched_at: float
+
+
+class DetailCache:
+    """Per-link cache of parsed details.
+
+    Entries younger than the TTL are served without a request. Older
+    entries are revalidated, and a page whose ETag or content hash did
+    not change is not parsed again.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.entries: Dict[str, CachedDetail] = {}
+        self.lock = threading.Lock()
+
+    def get(self, link: str) -> Optional[CachedDetail]:
+        with self.lock:
+            return self.entries.get(link)
+
+    def fresh(self, link: str) -> Optional[ProductDetail]:
+        entry = self.get(link)
+        if entry is None or time.monotonic() - entry.fetched_at > self.ttl:
+            return None
+        return entry.detail
+
+    def put(self, link: str, entry: CachedDetail):
+        with self.lock:
+            self.entries[link] = entry
+
+
+class HostLimits:
+    """Concurrent fetches allowed per host, shared by every enricher."""
+
+    def __init__(self, per_host: int):
+        self.per_host = per_host
+        self.semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self.lock = threading.Lock()
+
+    def get(self, link: str) -> threading.BoundedSemaphore:
+        host = urlsplit(link).netloc
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(
+                    self.per_host
+                )
+            return self.semaphores[host]
+
+
+class DetailEnricher:
+    """Fetch product detail pages concurrently, bounded per host.
+
+    Static pages go through a plain HTTP pool, the browser fetch is used
+    only when the static page has no details.
+    """
+
+    def __init__(
+        self,
+        http_client,
+        cache: DetailCache,
+        host_limits: HostLimits,
+        browser_fetch: Optional[Callable[[str], str]] = None,
+        workers: int = 8,
+    ):
+        self.http_client = http_client
+        self.cache = cache
+        self.host_limits = host_limits
+        self.browser_fetch = browser_fetch
+        self.workers = workers
+
+    def host_limit(self, link: str) -> threading.BoundedSemaphore:
+        return self.host_limits.get(link)
+
+    def fetch(self, link: str, cached: Optional[CachedDetail]):
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        with self.host_limit(link):
+            response = self.http_client.request(
+                "GET",
+                link,
+                headers=headers,
+                timeout=DETAIL_TIMEOUT,
+                retries=False,
+            )
+        return response.status, response.data, response.headers.get("ETag")
+
+    def detail(self, link: str) -> ProductDetail:
+        detail = self.cache.fresh(link)
+        if detail is not None:
+            return detail
+
+        cached = self.cache.get(link)
+        status, body, etag = self.fetch(link, cached)
+        if status == HTTP_NOT_MODIFIED and cached is not None:
+            return self.remember(
+                link, cached.detail, cached.content_hash, etag
+            )
+        if status != HTTP_OK:
+            raise RuntimeError(f"Detail page returned {status}")
+
+        content_hash = hashlib.sha256(body).hexdigest()
+        if cached is not None and cached.content_hash == content_hash:
+            return self.remember(link, cached.detail, content_hash, etag)
+
+        detail = parse_detail(body.decode(errors="replace"), link)
+        if is_empty(detail) and self.browser_fetch is not None:
+            # Rendered by JavaScript, worth a browser session.
+            logging.info(f"Falling back to browser for {link}")
+            with self.host_limit(link):
+                html = self.browser_fetch(link)
+            detail = parse_detail(html, link)
+        return self.remember(link, detail, content_hash, etag)
+
+    def remember(self, link, detail, content_hash, etag) -> ProductDetail:
+        self.cache.put(
+            link,
+            CachedDetail(
+                detail=detail,
+                content_hash=content_hash,
+                etag=etag,
+                fetched_at=time.monotonic(),
+            ),
+        )
+        return detail
+
+    def enrich(self, products: Iterable[Product]) -> Iterator[EnrichedProduct]:
+        """Yield products with their details as soon as each is fetched.
+
+        `products` is read lazily, detail pages of the first products are
+        fetched while later ones are still being listed.
+        """
+        seen = set()
+        with ThreadPoolExecutor(self.workers) as executor:
+            futures = {}
+            for product in products:
+                key = product.link or product.title
+                if key in seen:
+                    continue
+                seen.add(key)
+                if not product.link:
+                    yield EnrichedProduct(
+                        **product.model_dump(), detail=ProductDetail()
+                    )
+                    continue
+                futures[executor.submit(self.detail, product.link)] = product
+                for future in [future for future in futures if future.done()]:
+                    yield self.enriched(futures.pop(future), future)
+            for future in as_completed(futures):
+                yield self.enriched(futures[future], future)
+
+    def enriched(self, product: Product, future) -> EnrichedProduct:
+        try:
+            detail = future.result()
+        except Exception as e:
+            logging.error(f"Failed to enrich {product.link}: {e}")
+            detail = ProductDetail()
+        return EnrichedProduct(**product.model_dump(), detail=detail)
+
+
+@lru_cache(maxsize=1)
+def get_detail_cache() -> DetailCache:
+    return DetailCache(ttl=get_settings().enrich_ttl)
+
+
+@lru_cache(maxsize=1)
+def get_host_limits() -> HostLimits:
+    # Process-wide, concurrent requests share the limit of a host.
+    return HostLimits(per_host=get_settings().enrich_host_limit)
+
+
+@lru_cache(maxsize=1)
+def get_detail_http():
+    """HTTP pool of the static detail fetches, no browser involved."""
+    import urllib3
+
+    return urllib3.PoolManager(
+        num_pools=10, maxsize=get_settings().enrich_host_limit
+    )
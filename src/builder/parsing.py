@@ -0,0 +1,47 @@
+# src/builder/parsing.py
+
+import re
+from typing import List, Optional
+
+from src.models.product import Product
+
+MINIMUM_COLUMN_COUNT = 6
+
+PRICE_PATTERN = re.compile(r"[^\d.]")
+STOCK_PATTERN = re.compile(r"\((\d+)\)")
+
+
+def parse_price(text: str, pattern: re.Pattern = PRICE_PATTERN) -> float:
+    return float(pattern.sub("", text.strip()))
+
+
+def parse_stock(
+    text: str,
+    in_stock_text: str = "In Stock",
+    pattern: re.Pattern = STOCK_PATTERN,
+) -> tuple[str, int]:
+    stock_raw = text.strip()
+    if in_stock_text not in stock_raw:
+        return "Out of Stock", 0
+    return "In Stock", int(pattern.search(stock_raw).group(1))
+
+
+def product_from_cells(
+    cells: List[str], link: Optional[str], total: int
+) -> Product:
+    """Build a product from the cell texts of one `#product-tbody` row.
+
+    Shared by the live scraper and the offline snapshot re-parse, so both
+    always apply the same rules. Only the title, price and stock columns
+    are read, the link comes from the details button. Other layouts are
+    parsed by their compiled profile, see src/builder/profiles.py.
+    """
+    stock_status, stock_quantity = parse_stock(cells[4])
+    return Product(
+        title=cells[1].strip(),
+        price=parse_price(cells[3]),
+        link=link or "",
+        stock_status=stock_status,
+        stock_quantity=stock_quantity,
+        total=total,
+    )
@@ -1,40 +1,90 @@
 # src/builder/pool.py
 
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+from typing import Iterator
 
-from src.builder.scraper import PageObject
+from src.builder.scraper import SCRAPE_CHUNK_SIZE, PageObject
 
 logging.basicConfig(level=logging.INFO)
 
+# Seconds between checks for an abandoned stream while the queue is full.
+STREAM_PUT_TIMEOUT = 0.5
+
+_END = object()
+
 
 class ScrapePool:
-    def __init__(self, size: int, category: str):
+    def __init__(self, size: int, category: str, page_object=None):
         self.size = size
         self.category = category
-        self.page_object = PageObject(category=category)
+        self.page_object = page_object or PageObject(category=category)
 
-    def run_scraper(self):
-        logging.info(f"Start scraper: {self.category}")
-        products = self.page_object.scrape_products()
-        logging.info(f"Success scraper: {self.category} with {len(products)}")
+    def extract(self):
+        logging.info(f"Start extraction: {self.category}")
+        products = self.page_object.extract_products()
+        logging.info(f"Extracted {self.category} with {len(products)}")
         return products
 
     def pool_with_threads(self):
-        with ThreadPoolExecutor(self.size) as executor:
-            futures = [
-                executor.submit(self.run_scraper) for _ in range(self.size)
-            ]
-            all_products = []
-            for future in futures:
+        """Products of a single scrape on this pool's session.
+
+        A WebDriver session runs one command at a time, so parallel copies
+        of the scrape only queued on its lock and returned duplicate rows.
+        WORK_THREAD bounds concurrent requests instead, each request with
+        its own pooled session.
+        """
+        try:
+            products = self.extract()
+        except Exception as e:
+            logging.error(f"Erro there is an error: {e}")
+            return []
+        logging.info(f"Total of products: {len(products)}")
+        return products
+
+    def stream(
+        self, maxsize: int, chunk_size: int = SCRAPE_CHUNK_SIZE
+    ) -> Iterator:
+        """Yield chunks of products through a bounded queue.
+
+        The scraper blocks while `maxsize` chunks wait for the consumer,
+        so memory stays flat whatever the size of the catalog.
+        """
+        chunks = queue.Queue(maxsize=maxsize)
+        cancelled = threading.Event()
+
+        def put(item):
+            while not cancelled.is_set():
+                try:
+                    chunks.put(item, timeout=STREAM_PUT_TIMEOUT)
+                    return
+                except queue.Full:
+                    continue
+            raise RuntimeError("stream_cancelled")
+
+        def produce():
+            try:
+                self.page_object.stream_products(put, chunk_size=chunk_size)
+            except Exception as e:
+                logging.error(f"Stream of {self.category} stopped: {e}")
+            finally:
                 try:
-                    products = future.result()
-                    all_products.extend(products)
-                except Exception as e:
-                    logging.error(f"Erro there is an error: {e}")
-            return all_products
+                    put(_END)
+                except RuntimeError:
+                    pass
 
-        logging.info(f"Total of products: {len(all_products)}")
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is _END:
+                    break
+                yield chunk
+        finally:
+            cancelled.set()
+            producer.join()
 
     def close(self):
         if hasattr(self, "page_object"):
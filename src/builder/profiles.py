@@ -0,0 +1,163 @@
+# src/builder/profiles.py
+
+import json
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import TypeAdapter
+from selenium.webdriver.common.by import By
+
+from src.builder.parsing import parse_price, parse_stock
+from src.config.settings import get_settings
+from src.models.product import Product
+from src.models.site import DEFAULT_SITE, SiteProfile
+
+logging.basicConfig(level=logging.INFO)
+
+PROFILE_LIST_ADAPTER = TypeAdapter(List[SiteProfile])
+
+# Selectors are spliced in as JSON string literals, see SiteExtractor.
+
+TABLE_HTML_TEMPLATE = """
+const table = document.querySelector(%(table)s);
+return table ? table.outerHTML : document.documentElement.outerHTML;
+"""
+
+ROW_RANGE_TEMPLATE = """
+const rows = document.querySelectorAll(%(rows)s);
+const end = Math.min(arguments[1], rows.length);
+const out = [];
+for (let i = arguments[0]; i < end; i++) {
+    const button = rows[i].querySelector(%(link)s);
+    out.push([
+        Array.from(rows[i].cells, (cell) => cell.innerText),
+        button ? button.href : '',
+    ]);
+}
+return [rows.length, out];
+"""
+
+SELECTED_CATEGORY_TEMPLATE = """
+const filter = document.querySelector(%(category)s);
+return filter ? filter.options[filter.selectedIndex].text : null;
+"""
+
+# Cheap summary of the page, any change means someone else touched it.
+PAGE_FINGERPRINT_TEMPLATE = """
+const count = document.querySelector(%(count)s);
+const filter = document.querySelector(%(category)s);
+const table = document.querySelector(%(table)s);
+return [
+    document.readyState,
+    count ? count.textContent : '',
+    filter ? filter.value : '',
+    document.querySelectorAll(%(rows)s).length,
+    table ? table.textContent.length : -1,
+].join('|');
+"""
+
+
+class SiteExtractor:
+    """A site profile compiled once into locators, scripts and parse rules.
+
+    Rows are read through the row-range script, one command per chunk,
+    whatever the site.
+    """
+
+    def __init__(self, profile: SiteProfile, default_url: Optional[str]):
+        self.profile = profile
+        self.name = profile.name
+        self.url = profile.url or default_url
+        self.categories = profile.categories
+        self.default_category = profile.default_category
+        self.columns = profile.columns
+        self.min_columns = profile.parse.min_columns
+
+        self.rows = (By.CSS_SELECTOR, profile.row_selector)
+        self.count = (By.CSS_SELECTOR, profile.count_selector)
+        self.category_filter = (By.CSS_SELECTOR, profile.category_selector)
+
+        selectors = {
+            "table": json.dumps(profile.table_selector),
+            "rows": json.dumps(profile.row_selector),
+            "link": json.dumps(profile.link_selector),
+            "count": json.dumps(profile.count_selector),
+            "category": json.dumps(profile.category_selector),
+        }
+        self.table_html_script = TABLE_HTML_TEMPLATE % selectors
+        self.row_range_script = ROW_RANGE_TEMPLATE % selectors
+        self.selected_category_script = SELECTED_CATEGORY_TEMPLATE % selectors
+        self.fingerprint_script = PAGE_FINGERPRINT_TEMPLATE % selectors
+
+        self.price_pattern = re.compile(profile.parse.price_strip)
+        self.stock_pattern = re.compile(profile.parse.stock_quantity)
+        self.in_stock_text = profile.parse.in_stock_text
+
+    def product(self, cells: List[str], link: Optional[str], total: int):
+        stock_status, stock_quantity = parse_stock(
+            cells[self.columns.stock], self.in_stock_text, self.stock_pattern
+        )
+        return Product(
+            title=cells[self.columns.title].strip(),
+            price=parse_price(cells[self.columns.price], self.price_pattern),
+            link=link or "",
+            stock_status=stock_status,
+            stock_quantity=stock_quantity,
+            total=total,
+        )
+
+
+def load_profiles(path: str) -> List[SiteProfile]:
+    """Profiles of a JSON file holding a list of profile objects."""
+    with open(path) as source:
+        return PROFILE_LIST_ADAPTER.validate_json(source.read())
+
+
+class SiteRegistry:
+    """Known site profiles, each compiled on first use and then reused."""
+
+    def __init__(
+        self, profiles: Iterable[SiteProfile], default_url: Optional[str]
+    ):
+        self.profiles: Dict[str, SiteProfile] = {
+            profile.name: profile for profile in profiles
+        }
+        self.default_url = default_url
+        self.extractors: Dict[str, SiteExtractor] = {}
+        self.lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        return list(self.profiles)
+
+    def profile(self, name: str) -> Optional[SiteProfile]:
+        return self.profiles.get(name)
+
+    def extractor(self, name: str) -> SiteExtractor:
+        with self.lock:
+            extractor = self.extractors.get(name)
+            if extractor is None:
+                extractor = SiteExtractor(
+                    self.profiles[name], self.default_url
+                )
+                self.extractors[name] = extractor
+            return extractor
+
+
+@lru_cache(maxsize=1)
+def get_site_registry() -> SiteRegistry:
+    settings = get_settings()
+    profiles = [
+        SiteProfile(name=DEFAULT_SITE, max_concurrency=settings.work_thread)
+    ]
+    if settings.site_profiles:
+        # A profile named "default" in the file replaces the built-in one.
+        profiles.extend(load_profiles(settings.site_profiles))
+        logging.info(f"Loaded site profiles from {settings.site_profiles}")
+    return SiteRegistry(profiles, default_url=settings.url)
+
+
+def default_extractor() -> SiteExtractor:
+    return get_site_registry().extractor(DEFAULT_SITE)
@@ -1,92 +1,165 @@
 # src/builder/scraper.py
 
 import logging
-import os
-import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
 
 import urllib3
-from dotenv import load_dotenv
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-from src.models.product import CATEGORY_ORDER, Product
+from src.builder.profiles import SiteExtractor, default_extractor
+from src.builder.watchdog import delete_session, quit_with_timeout
+from src.config.settings import get_settings
+from src.models.site import WaitBudget
+from src.monitoring.metrics import METRICS
+from src.storage.snapshot import get_snapshot_store
 
-load_dotenv()
+settings = get_settings()
 
-URL_BASE = os.environ.get("URL")
-HEADLES = os.environ.get("HEADLES")
-NO_SANDBOX = os.environ.get("NO_SANDBOX")
-DISABLE_DEV_SHM_USAGE = os.environ.get("DISABLE_DEV_SHM_USAGE")
-SELENIUM_TESTING = os.environ.get("SELENIUM_TESTING")
-HUB_SELENIUM = os.getenv("HUB_SELENIUM")
+HEADLES = settings.headles
+NO_SANDBOX = settings.no_sandbox
+DISABLE_DEV_SHM_USAGE = settings.disable_dev_shm_usage
+SELENIUM_TESTING = settings.selenium_testing
+HUB_SELENIUM = settings.hub_selenium
+PAGE_MAX_AGE = settings.page_max_age
+QUIT_TIMEOUT = settings.quit_timeout
+SESSION_TAG = settings.session_tag
 
 
-MINIMUM_COLUMN_COUNT = 6
+# Retry budgets: failed rows are re-read first, then the category is
+# re-selected in place, and the page is reloaded only as a last resort.
+ROW_RETRY_ATTEMPTS = 2
+CATEGORY_RETRY_ATTEMPTS = 2
+PAGE_RELOAD_ATTEMPTS = 1
+
+# Rows per command in streaming mode, bounds the memory of one read.
+SCRAPE_CHUNK_SIZE = settings.scrape_chunk_size
+
+
+@dataclass
+class PageState:
+    url: str
+    category: str
+    fingerprint: str
+    loaded_at: float
+
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
 
 
 class WebdriverManager:
-    def __init__(self):
+    def __init__(self, waits: Optional[WaitBudget] = None):
         options = Options()
-        options.add_argument(f"{HEADLES}")
-        options.add_argument(f"{NO_SANDBOX}")
-        options.add_argument(f"{DISABLE_DEV_SHM_USAGE}")
+        for argument in (HEADLES, NO_SANDBOX, DISABLE_DEV_SHM_USAGE):
+            if argument:
+                options.add_argument(argument)
+        # Lets the grid's sessions be traced back to this service.
+        options.set_capability("se:name", SESSION_TAG)
         self.logger = logging.getLogger(f"{SELENIUM_TESTING}")
         self.http_client = urllib3.PoolManager(num_pools=10, maxsize=10)
         self.driver = webdriver.Remote(
             command_executor=HUB_SELENIUM, options=options, keep_alive=True
         )
-        self.wait = WebDriverWait(self.driver, 25)
-        self.driver.set_page_load_timeout(30)
-        self.driver.implicitly_wait(10)
+        self.apply_waits(waits or WaitBudget())
+        self.created_at = time.monotonic()
+
+    def apply_waits(self, waits: WaitBudget):
+        self.wait = WebDriverWait(self.driver, waits.element)
+        self.driver.set_page_load_timeout(waits.page_load)
+        self.driver.implicitly_wait(waits.implicit)
 
 
 class PageObject(WebdriverManager):
-    def __init__(self, category: list):
+    def __init__(self, category: list, site: Optional[SiteExtractor] = None):
         self.category = category
-        super().__init__()
+        # Selectors, scripts and parse rules of the site being scraped.
+        self.site = site or default_extractor()
+        self.expected_count = None
+        self.page_state: Optional[PageState] = None
+        self.loaded_at = None
+        # A WebDriver session is not thread safe, scrapes take turns.
+        self.lock = threading.RLock()
+        super().__init__(waits=self.site.profile.waits)
+
+    def use_site(self, site: SiteExtractor):
+        """Point a reused session at another site, its page is stale."""
+        with self.lock:
+            if site is self.site:
+                return
+            self.site = site
+            self.page_state = None
+            self.apply_waits(site.profile.waits)
 
-    def __visibility_of_element_located_product_rows(self):
-        # Wait for product rows to be present and visible
+    def current_category(self) -> Optional[str]:
         try:
-            product_rows = self.wait.until(
-                EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, "#product-tbody tr")
-                )
+            selected = self.driver.execute_script(
+                self.site.selected_category_script
             )
-            self.logger.info(f"Found {len(product_rows)} product rows")
-            return product_rows
+        except Exception:
+            return None
+        return selected if selected in self.site.categories else None
+
+    def page_fingerprint(self) -> Optional[str]:
+        try:
+            return self.driver.execute_script(self.site.fingerprint_script)
         except Exception as e:
-            self.logger.error(f"Could not load product rows: {e}")
-            return []
+            self.logger.warning(f"Could not fingerprint page: {e}")
+            return None
+
+    def page_is_reusable(self) -> bool:
+        state = self.page_state
+        if state is None:
+            return False
+        if state.age() > PAGE_MAX_AGE:
+            self.logger.info(f"Page is {state.age():.0f}s old, reloading")
+            return False
+        try:
+            url = self.driver.current_url
+        except Exception:
+            return False
+        fingerprint = self.page_fingerprint()
+        return (
+            url == state.url
+            and fingerprint is not None
+            and fingerprint == state.fingerprint
+        )
 
     def select_category(self, products: list):
-        if self.category != "All Categories":
+        # Move relative to the option already selected on the page, so a
+        # loaded page can switch category without a reload.
+        categories = self.site.categories
+        selected = self.current_category() or self.site.default_category
+        try:
+            position = categories[self.category] - categories[selected]
+        except KeyError:
+            self.logger.error(
+                f"Failed to select category '{self.category}': "
+                f"not in the {self.site.name} profile"
+            )
+            return False
+        if position:
             try:
                 self.logger.info(f"Selecting category {self.category}")
 
                 self.wait.until(
-                    EC.visibility_of_element_located(
-                        (By.ID, "category-filter")
-                    )
+                    EC.visibility_of_element_located(self.site.category_filter)
                 ).click()
 
                 # Wait for dropdown to be visible
                 self.wait.until(
-                    EC.visibility_of_element_located(
-                        (By.ID, "category-filter")
-                    )
+                    EC.visibility_of_element_located(self.site.category_filter)
                 )
 
-                position = CATEGORY_ORDER[self.category]
-                for _ in range(position):
-                    ActionChains(self.driver).key_down(Keys.DOWN).pause(
-                        1
-                    ).perform()
+                key = Keys.DOWN if position > 0 else Keys.UP
+                for _ in range(abs(position)):
+                    ActionChains(self.driver).key_down(key).pause(1).perform()
 
                 ActionChains(self.driver).key_down(Keys.ENTER).pause(
                     1
@@ -94,105 +167,250 @@ class PageObject(WebdriverManager):
 
                 # Wait for product table to update
                 self.wait.until(
-                    lambda d: len(
-                        d.find_elements(By.CSS_SELECTOR, "#product-tbody tr")
-                    )
-                    > 0
+                    lambda d: len(d.find_elements(*self.site.rows)) > 0
                 )
                 self.logger.info(f"Category '{self.category}' selected.")
             except Exception as e:
                 self.logger.error(
                     f"Failed to select category '{self.category}': {e}"
                 )
-                return []
+                return False
         try:
             expected_count = int(
                 self.wait.until(
-                    EC.presence_of_element_located((By.ID, "product-count"))
+                    EC.presence_of_element_located(self.site.count)
                 ).text.strip()
             )
             if expected_count is not None and len(products) != expected_count:
                 self.logger.warning(f"Expected {expected_count} products")
         except Exception:
             expected_count = None
+        self.expected_count = expected_count
+        return True
 
     def total_products(self):
         # total products in category
         try:
             product_count_elem = self.wait.until(
-                EC.presence_of_element_located((By.ID, "product-count"))
+                EC.presence_of_element_located(self.site.count)
             )
             expected_count = int(product_count_elem.text.strip())
             return expected_count
         except Exception as e:
             self.logger.warning(f"Could not retrieve product count: {e}")
-            expected_count = None
+            return None
 
-    def scrape_products(self):
-        self.logger.info(f"Scraping category: {self.category}")
-        self.driver.get(URL_BASE)
+    def load_page(self):
+        self.page_state = None
+        self.driver.get(self.site.url)
+        self.loaded_at = time.monotonic()
+        # Wait for page to load
+        self.wait.until(EC.presence_of_element_located(self.site.count))
 
-        products = []
+    def select_category_with_retry(self, products: list):
+        """Select the category, reloading the page only as a last resort."""
+        for reload in range(PAGE_RELOAD_ATTEMPTS + 1):
+            if reload:
+                self.logger.warning(
+                    f"Reloading page to select '{self.category}' "
+                    f"({reload}/{PAGE_RELOAD_ATTEMPTS})"
+                )
+                try:
+                    self.load_page()
+                except Exception as e:
+                    self.logger.error(f"Failed to reload page: {e}")
+                    continue
+            for attempt in range(CATEGORY_RETRY_ATTEMPTS):
+                if self.select_category(products=products):
+                    return True
+                self.logger.warning(
+                    f"Retrying category '{self.category}' "
+                    f"({attempt + 1}/{CATEGORY_RETRY_ATTEMPTS})"
+                )
+        return False
 
-        # Wait for page to load
-        self.wait.until(
-            EC.presence_of_element_located((By.ID, "product-count"))
+    def prepare_page(self) -> bool:
+        if self.page_is_reusable():
+            self.logger.info(
+                f"Reusing loaded page ({self.page_state.category})"
+            )
+        else:
+            self.load_page()
+
+        if not self.select_category_with_retry(products=[]):
+            # Never fall back to the unfiltered table for a category.
+            self.logger.error(f"Giving up on category '{self.category}'")
+            self.page_state = None
+            return False
+        return True
+
+    def read_rows(self, start: int, end: int) -> tuple[int, list]:
+        """Cell texts and link of rows [start, end) in a single command."""
+        total, rows = self.driver.execute_script(
+            self.site.row_range_script, start, end
         )
-        self.select_category(products=products)
-        product_rows = self.__visibility_of_element_located_product_rows()
+        return int(total), rows
 
-        for row in product_rows:
-            try:
-                # Wait for row to be visible
-                self.wait.until(EC.visibility_of(row))
-                cols = row.find_elements(By.TAG_NAME, "td")
-                if len(cols) < MINIMUM_COLUMN_COUNT:
-                    self.logger.warning("Row does not have enough columns")
-                    continue
+    def stream_products(
+        self,
+        sink,
+        chunk_size: int = SCRAPE_CHUNK_SIZE,
+        snapshot: bool = False,
+    ):
+        """Push products to `sink` chunk by chunk.
 
-                title = cols[1].text.strip()
-                price = float(re.sub(r"[^\d.]", "", cols[3].text.strip()))
-                stock_raw = cols[4].text.strip()
-                stock_status = (
-                    "In Stock" if "In Stock" in stock_raw else "Out of Stock"
-                )
-                stock_quantity = (
-                    int(re.search(r"\((\d+)\)", stock_raw).group(1))
-                    if "In Stock" in stock_raw
-                    else 0
+        Rows are read by index range, so no WebElement is held and at
+        most one chunk of products is alive here at a time. A snapshot
+        holds the whole table, it is only taken when asked for.
+        """
+        with self.lock:
+            self.logger.info(f"Streaming category: {self.category}")
+            if not self.prepare_page():
+                return
+            if snapshot:
+                self.capture_snapshot()
+            start, sent = 0, 0
+            while True:
+                total, rows = self.read_rows(start, start + chunk_size)
+                parsed, failed = self.parse_rows(rows, start)
+                del rows
+                parsed.update(self.retry_rows(failed))
+                chunk = [parsed[index] for index in sorted(parsed)]
+                if chunk:
+                    sink(chunk)
+                    sent += len(chunk)
+                del parsed, chunk
+                start += chunk_size
+                if start >= total:
+                    break
+            self.logger.info(f"Streamed {sent} of {total} products")
+            if self.expected_count is not None:
+                self.logger.info(
+                    f"Parsed {sent} of {self.expected_count} products"
                 )
+            self.remember_page_state()
 
-                try:
-                    link_elem = cols[5].find_element(
-                        By.CLASS_NAME, "view-details-btn"
-                    )
-                    link = link_elem.get_attribute("href") or ""
-                except AttributeError:
-                    link = ""
-                    self.logger.warning(f"No link found for product: {title}")
-
-                products.append(
-                    Product(
-                        title=title,
-                        price=price,
-                        link=link,
-                        stock_status=stock_status,
-                        stock_quantity=stock_quantity,
-                        total=self.total_products(),
-                    )
+    def parse_rows(self, rows: list, start: int) -> tuple[dict, list]:
+        """Products by row index, and the indexes that failed to parse."""
+        parsed, failed = {}, []
+        for index, (cells, link) in enumerate(rows, start):
+            if len(cells) < self.site.min_columns:
+                self.logger.warning(f"Row {index} has few columns")
+                continue
+            try:
+                parsed[index] = self.site.product(
+                    cells, link, total=self.expected_count or 0
                 )
-
             except Exception as e:
-                self.logger.error(f"Failed to scrape product: {e}")
+                self.logger.error(f"Failed to scrape product {index}: {e}")
+                failed.append(index)
+        return parsed, failed
+
+    def retry_rows(self, failed: list) -> dict:
+        # Re-read only the failed rows, the DOM may have re-rendered them.
+        salvaged = {}
+        for attempt in range(ROW_RETRY_ATTEMPTS):
+            if not failed:
+                break
+            self.logger.warning(
+                f"Retrying {len(failed)} rows "
+                f"({attempt + 1}/{ROW_RETRY_ATTEMPTS})"
+            )
+            retried = []
+            for index in failed:
+                _, rows = self.read_rows(index, index + 1)
+                parsed, still_failed = self.parse_rows(rows, index)
+                salvaged.update(parsed)
+                retried.extend(still_failed)
+            failed = retried
+        if failed:
+            self.logger.error(f"Could not salvage rows: {failed}")
+        return salvaged
+
+    def warm_up(self):
+        """Open the listing page ahead of the first scrape."""
+        with self.lock:
+            self.load_page()
+            self.remember_page_state()
+
+    def extract_products(self) -> list:
+        """Every product of the category, read through the batch path.
 
+        The only parser, the default site goes through it like any
+        other profile.
+        """
+        products = []
+        self.stream_products(products.extend, snapshot=True)
         return products
 
+    def capture_snapshot(self):
+        # Raw table kept for offline re-parse, see src/storage/reparse.py
+        store = get_snapshot_store()
+        if store is None:
+            return
+        try:
+            html = self.driver.execute_script(self.site.table_html_script)
+            digest = store.save(
+                self.category,
+                html,
+                self.expected_count,
+                site=self.site.name,
+                page_url=self.driver.current_url,
+            )
+            self.logger.info(f"Stored snapshot {digest[:12]}")
+        except Exception as e:
+            self.logger.warning(f"Could not store snapshot: {e}")
+
+    def remember_page_state(self):
+        fingerprint = self.page_fingerprint()
+        try:
+            url = self.driver.current_url
+        except Exception:
+            url = None
+        if fingerprint is None or url is None or self.loaded_at is None:
+            self.page_state = None
+            return
+        self.page_state = PageState(
+            url=url,
+            category=self.category,
+            fingerprint=fingerprint,
+            loaded_at=self.loaded_at,
+        )
+
+    def fetch_page_source(self, link: str) -> str:
+        with self.lock:
+            # Navigating away invalidates the listing page.
+            self.page_state = None
+            self.driver.get(link)
+            return self.driver.page_source
+
+    def is_alive(self) -> bool:
+        if self.driver is None:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
     def close(self):
         if self.driver is not None:
             try:
-                self.driver.quit()
-                self.logger.info("WebDriver closed successfully")
+                if quit_with_timeout(self.driver, QUIT_TIMEOUT):
+                    self.logger.info("WebDriver closed successfully")
+                else:
+                    self.logger.error(
+                        f"WebDriver quit timed out after {QUIT_TIMEOUT}s"
+                    )
+                    METRICS.inc("scraper_quit_timeouts_total")
+                    if HUB_SELENIUM:
+                        delete_session(
+                            self.http_client,
+                            HUB_SELENIUM,
+                            self.driver.session_id,
+                        )
             except Exception as e:
                 self.logger.error(f"Failed to close WebDriver: {e}")
             finally:
                 self.driver = None
+                self.page_state = None
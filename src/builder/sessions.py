@@ -0,0 +1,133 @@
+# src/builder/sessions.py
+
+import logging
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+
+from src.builder.profiles import SiteExtractor, default_extractor
+from src.builder.scraper import PageObject
+from src.builder.watchdog import SessionWatchdog, get_watchdog
+from src.config.settings import get_settings
+from src.monitoring.metrics import METRICS
+
+logging.basicConfig(level=logging.INFO)
+
+
+class SessionPool:
+    """Keeps browser sessions open between requests.
+
+    Released sessions keep their loaded page, so the next scrape can
+    switch category in place instead of opening a new browser. The
+    watchdog checks sessions on the way in and out, and `sweep` recycles
+    worn out idle sessions before anyone asks for them.
+    """
+
+    def __init__(
+        self, max_idle: int, watchdog: Optional[SessionWatchdog] = None
+    ):
+        self.max_idle = max_idle
+        self.watchdog = watchdog or SessionWatchdog()
+        self.idle = deque()
+        # Sessions handed out, or out of `idle` while a sweep checks them.
+        self.in_use = 0
+        self.sweeping = 0
+        self.lock = threading.Lock()
+
+    def acquire(
+        self, category: str, site: Optional[SiteExtractor] = None
+    ) -> PageObject:
+        while True:
+            with self.lock:
+                page_object = self.idle.pop() if self.idle else None
+            if page_object is None:
+                logging.info(f"Opening browser session for {category}")
+                if site is None:
+                    page_object = PageObject(category=category)
+                else:
+                    page_object = PageObject(category=category, site=site)
+                break
+            reason = self.watchdog.check(page_object)
+            if reason is None:
+                page_object.category = category
+                page_object.use_site(site or default_extractor())
+                break
+            self.watchdog.recycle(page_object, reason)
+        with self.lock:
+            self.in_use += 1
+        return page_object
+
+    def release(self, page_object: PageObject):
+        with self.lock:
+            self.in_use = max(self.in_use - 1, 0)
+            full = len(self.idle) >= self.max_idle
+        if full:
+            page_object.close()
+            return
+        reason = self.watchdog.check(page_object)
+        if reason is not None:
+            self.watchdog.recycle(page_object, reason)
+            return
+        with self.lock:
+            if len(self.idle) < self.max_idle:
+                self.idle.append(page_object)
+                return
+        page_object.close()
+
+    def discard(self, page_object: PageObject):
+        """Quit a session handed out by `acquire` instead of releasing it."""
+        with self.lock:
+            self.in_use = max(self.in_use - 1, 0)
+        page_object.close()
+
+    def sweep(self) -> int:
+        """Recycle degraded idle sessions, returns how many were closed."""
+        with self.lock:
+            sessions, self.idle = list(self.idle), deque()
+            self.sweeping = len(sessions)
+        healthy, recycled = [], 0
+        for page_object in sessions:
+            reason = self.watchdog.check(page_object)
+            if reason is None:
+                healthy.append(page_object)
+            else:
+                self.watchdog.recycle(page_object, reason)
+                recycled += 1
+        with self.lock:
+            # Sessions released during the sweep stay ahead of old ones.
+            self.idle.extendleft(reversed(healthy))
+            self.sweeping = 0
+            overflow = [
+                self.idle.popleft()
+                for _ in range(max(len(self.idle) - self.max_idle, 0))
+            ]
+        for page_object in overflow:
+            page_object.close()
+        return recycled
+
+    def size(self) -> int:
+        with self.lock:
+            return len(self.idle)
+
+    def live(self) -> int:
+        """Open sessions, idle or handed out."""
+        with self.lock:
+            return len(self.idle) + self.in_use + self.sweeping
+
+    def close(self):
+        with self.lock:
+            sessions, self.idle = list(self.idle), deque()
+        for page_object in sessions:
+            page_object.close()
+
+
+@lru_cache(maxsize=1)
+def get_session_pool() -> SessionPool:
+    pool = SessionPool(
+        max_idle=get_settings().session_pool_size, watchdog=get_watchdog()
+    )
+    METRICS.gauge(
+        "scraper_sessions_idle", pool.size, "Browser sessions kept open."
+    )
+    return pool
@@ -0,0 +1,264 @@
+# src/builder/watchdog.py
+
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Iterable, List, Optional
+
+from src.config.settings import get_settings
+from src.monitoring.metrics import METRICS
+
+logging.basicConfig(level=logging.INFO)
+
+# Probes averaged into the baseline before the trend is followed.
+BASELINE_SAMPLES = 5
+LATENCY_ALPHA = 0.2
+# Probe latency under this never counts as degraded, whatever the trend.
+LATENCY_FLOOR = 0.05
+
+MEBIBYTE = 1024 * 1024
+MEMORY_METRIC = "JSHeapUsedSize"
+MEMORY_SCRIPT = """
+return performance.memory ? performance.memory.usedJSHeapSize : null;
+"""
+
+GRID_TIMEOUT = 5
+
+METRICS.describe(
+    "scraper_session_recycles_total", "Browser sessions recycled, by reason."
+)
+METRICS.describe(
+    "scraper_quit_timeouts_total", "WebDriver quits abandoned after timeout."
+)
+METRICS.describe(
+    "scraper_orphan_sessions_removed_total",
+    "Grid sessions of a previous run deleted at startup.",
+)
+
+
+@dataclass
+class SessionHealth:
+    created_at: float
+    samples: int = 0
+    baseline: float = 0
+    latency: float = 0
+
+    def observe(self, seconds: float):
+        self.samples += 1
+        if self.samples <= BASELINE_SAMPLES:
+            self.baseline += (seconds - self.baseline) / self.samples
+            self.latency = self.baseline
+        else:
+            self.latency += LATENCY_ALPHA * (seconds - self.latency)
+
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class SessionWatchdog:
+    """Decides when a browser session is worn out and should be replaced.
+
+    A session is recycled when it is older than `max_age`, when its
+    probe latency trends above `latency_factor` times its own baseline,
+    or when the page heap grows past `max_memory_mb`. Zero disables a
+    limit.
+    """
+
+    def __init__(
+        self,
+        max_age: float = 0,
+        max_memory_mb: float = 0,
+        latency_factor: float = 0,
+    ):
+        self.max_age = max_age
+        self.max_memory_mb = max_memory_mb
+        self.latency_factor = latency_factor
+        self.sessions = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+
+    def health(self, page_object) -> SessionHealth:
+        with self.lock:
+            health = self.sessions.get(page_object)
+            if health is None:
+                created_at = getattr(page_object, "created_at", None)
+                health = SessionHealth(created_at or time.monotonic())
+                self.sessions[page_object] = health
+            return health
+
+    def probe(self, page_object) -> bool:
+        started = time.monotonic()
+        alive = page_object.is_alive()
+        if alive:
+            self.health(page_object).observe(time.monotonic() - started)
+        return alive
+
+    def memory_mb(self, page_object) -> Optional[float]:
+        driver = page_object.driver
+        try:
+            # Chromium drivers speak CDP directly, Remote ones do not.
+            driver.execute_cdp_cmd("Performance.enable", {})
+            result = driver.execute_cdp_cmd("Performance.getMetrics", {})
+            metrics = {
+                metric["name"]: metric["value"]
+                for metric in result.get("metrics", [])
+            }
+            if MEMORY_METRIC in metrics:
+                return metrics[MEMORY_METRIC] / MEBIBYTE
+        except Exception:
+            pass
+        try:
+            used = driver.execute_script(MEMORY_SCRIPT)
+        except Exception:
+            return None
+        return used / MEBIBYTE if used else None
+
+    def degraded(self, page_object) -> Optional[str]:
+        health = self.health(page_object)
+        if self.max_age and health.age() > self.max_age:
+            return "age"
+        if (
+            self.latency_factor
+            and health.samples > BASELINE_SAMPLES
+            and health.latency > LATENCY_FLOOR
+            and health.latency > health.baseline * self.latency_factor
+        ):
+            return "latency"
+        if self.max_memory_mb:
+            memory = self.memory_mb(page_object)
+            if memory is not None and memory > self.max_memory_mb:
+                return "memory"
+        return None
+
+    def check(self, page_object) -> Optional[str]:
+        """Why the session should be recycled, None when it is healthy."""
+        if not self.probe(page_object):
+            return "dead"
+        return self.degraded(page_object)
+
+    def recycle(self, page_object, reason: str):
+        logging.info(f"Recycling browser session: {reason}")
+        METRICS.inc("scraper_session_recycles_total", reason=reason)
+        with self.lock:
+            self.sessions.pop(page_object, None)
+        page_object.close()
+
+
+def quit_with_timeout(driver, timeout: float) -> bool:
+    """Quit in a daemon thread, False when it did not finish in time."""
+    errors = []
+
+    def quit_driver():
+        try:
+            driver.quit()
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(
+        target=quit_driver, name="webdriver-quit", daemon=True
+    )
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        return False
+    if errors:
+        raise errors[0]
+    return True
+
+
+def grid_root(hub_url: str) -> str:
+    root = hub_url.rstrip("/")
+    return root[: -len("/wd/hub")] if root.endswith("/wd/hub") else root
+
+
+def delete_session(http_client, hub_url: str, session_id: str) -> bool:
+    try:
+        response = http_client.request(
+            "DELETE",
+            f"{grid_root(hub_url)}/session/{session_id}",
+            timeout=GRID_TIMEOUT,
+            retries=False,
+        )
+    except Exception as e:
+        logging.error(f"Failed to delete grid session {session_id}: {e}")
+        return False
+    # Not found means the grid already dropped it.
+    return response.status < HTTPStatus.BAD_REQUEST or (
+        response.status == HTTPStatus.NOT_FOUND
+    )
+
+
+def grid_status(
+    http_client, hub_url: str, timeout: float = GRID_TIMEOUT
+) -> dict:
+    response = http_client.request(
+        "GET",
+        f"{grid_root(hub_url)}/status",
+        timeout=timeout,
+        retries=False,
+    )
+    return response.json().get("value") or {}
+
+
+def hub_ready(http_client, hub_url: str, timeout: float) -> bool:
+    """Whether the grid answers and can take new sessions."""
+    try:
+        return bool(grid_status(http_client, hub_url, timeout).get("ready"))
+    except Exception as e:
+        logging.warning(f"Selenium hub is not reachable: {e}")
+        return False
+
+
+def grid_sessions(http_client, hub_url: str) -> List[dict]:
+    value = grid_status(http_client, hub_url)
+    return [
+        slot["session"]
+        for node in value.get("nodes") or []
+        for slot in node.get("slots") or []
+        if slot.get("session")
+    ]
+
+
+def cleanup_orphaned_sessions(
+    http_client, hub_url: str, tag: str, keep: Iterable[str] = ()
+) -> List[str]:
+    """Delete grid sessions tagged by this service that nobody owns.
+
+    Sessions left behind by a crashed run hold grid slots until the
+    grid's own idle timeout, so they are removed at startup.
+    """
+    keep = set(keep)
+    removed = []
+    for session in grid_sessions(http_client, hub_url):
+        session_id = session.get("sessionId")
+        capabilities = session.get("capabilities") or {}
+        if capabilities.get("se:name") != tag or session_id in keep:
+            continue
+        if delete_session(http_client, hub_url, session_id):
+            removed.append(session_id)
+    if removed:
+        logging.info(f"Removed {len(removed)} orphaned grid sessions")
+        METRICS.inc("scraper_orphan_sessions_removed_total", len(removed))
+    return removed
+
+
+@lru_cache(maxsize=1)
+def get_grid_http():
+    """Pool of the grid status and cleanup calls, apart from the sessions."""
+    # Imported on first use, the app starts without loading urllib3.
+    import urllib3
+
+    return urllib3.PoolManager(num_pools=1, maxsize=2)
+
+
+@lru_cache(maxsize=1)
+def get_watchdog() -> SessionWatchdog:
+    settings = get_settings()
+    return SessionWatchdog(
+        max_age=settings.session_max_age,
+        max_memory_mb=settings.session_max_memory_mb,
+        latency_factor=settings.session_latency_factor,
+    )
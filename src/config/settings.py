@@ -0,0 +1,159 @@
+# src/config/settings.py
+
+import os
+from functools import lru_cache
+from typing import List, Mapping, Optional
+
+from pydantic import BaseModel, model_validator
+
+from src.models.product import CATEGORY_ORDER
+
+
+class Settings(BaseModel):
+    url: Optional[str] = None
+    headles: str = ""
+    no_sandbox: str = ""
+    disable_dev_shm_usage: str = ""
+    hub_selenium: Optional[str] = None
+    selenium_testing: str = ""
+    work_thread: int = 1
+    cache_ttl: float = 0
+    page_max_age: float = 300
+    session_pool_size: int = 0
+    history_path: Optional[str] = None
+    enrich_ttl: float = 3600
+    enrich_workers: int = 8
+    enrich_host_limit: int = 4
+    stale_ttl: float = 0
+    rate_limit_rate: float = 0
+    rate_limit_burst: float = 20
+    rate_limit_scrape_cost: float = 10
+    reserved_workers: int = 0
+    snapshot_dir: Optional[str] = None
+    scrape_chunk_size: int = 500
+    stream_queue_size: int = 4
+    session_max_age: float = 1800
+    session_max_memory_mb: float = 1024
+    session_latency_factor: float = 3
+    quit_timeout: float = 10
+    watchdog_interval: float = 60
+    session_tag: str = "testing-selenium-products"
+    cleanup_orphans: bool = False
+    site_profiles: Optional[str] = None
+    warm_sessions: int = 0
+    warm_categories: List[str] = []
+
+    @model_validator(mode="after")
+    def primed_cache_is_served(self) -> "Settings":
+        # Entries primed with no TTL would never be served from cache.
+        if self.warm_categories and not self.cache_ttl:
+            raise ValueError("Invalid WARM_CATEGORIES: requires CACHE_TTL > 0")
+        return self
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "Settings":
+        """Read and validate the environment, raising ValueError early."""
+        return cls(
+            url=environ.get("URL") or None,
+            headles=environ.get("HEADLES", ""),
+            no_sandbox=environ.get("NO_SANDBOX", ""),
+            disable_dev_shm_usage=environ.get("DISABLE_DEV_SHM_USAGE", ""),
+            hub_selenium=environ.get("HUB_SELENIUM") or None,
+            selenium_testing=environ.get("SELENIUM_TESTING", ""),
+            work_thread=parse_number(environ, "WORK_THREAD", int, 1, 1),
+            cache_ttl=parse_number(environ, "CACHE_TTL", float, 0, 0),
+            page_max_age=parse_number(environ, "PAGE_MAX_AGE", float, 300, 0),
+            session_pool_size=parse_number(
+                environ, "SESSION_POOL_SIZE", int, 0, 0
+            ),
+            history_path=environ.get("HISTORY_PATH") or None,
+            enrich_ttl=parse_number(environ, "ENRICH_TTL", float, 3600, 0),
+            enrich_workers=parse_number(environ, "ENRICH_WORKERS", int, 8, 1),
+            enrich_host_limit=parse_number(
+                environ, "ENRICH_HOST_LIMIT", int, 4, 1
+            ),
+            stale_ttl=parse_number(environ, "STALE_TTL", float, 0, 0),
+            rate_limit_rate=parse_number(
+                environ, "RATE_LIMIT_RATE", float, 0, 0
+            ),
+            rate_limit_burst=parse_number(
+                environ, "RATE_LIMIT_BURST", float, 20, 1
+            ),
+            rate_limit_scrape_cost=parse_number(
+                environ, "RATE_LIMIT_SCRAPE_COST", float, 10, 1
+            ),
+            reserved_workers=parse_number(
+                environ, "RESERVED_WORKERS", int, 0, 0
+            ),
+            snapshot_dir=environ.get("SNAPSHOT_DIR") or None,
+            scrape_chunk_size=parse_number(
+                environ, "SCRAPE_CHUNK_SIZE", int, 500, 1
+            ),
+            stream_queue_size=parse_number(
+                environ, "STREAM_QUEUE_SIZE", int, 4, 1
+            ),
+            session_max_age=parse_number(
+                environ, "SESSION_MAX_AGE", float, 1800, 0
+            ),
+            session_max_memory_mb=parse_number(
+                environ, "SESSION_MAX_MEMORY_MB", float, 1024, 0
+            ),
+            session_latency_factor=parse_number(
+                environ, "SESSION_LATENCY_FACTOR", float, 3, 0
+            ),
+            quit_timeout=parse_number(environ, "QUIT_TIMEOUT", float, 10, 0),
+            watchdog_interval=parse_number(
+                environ, "WATCHDOG_INTERVAL", float, 60, 0
+            ),
+            session_tag=environ.get("SESSION_TAG")
+            or "testing-selenium-products",
+            cleanup_orphans=parse_flag(environ, "CLEANUP_ORPHANS", False),
+            site_profiles=environ.get("SITE_PROFILES") or None,
+            warm_sessions=parse_number(environ, "WARM_SESSIONS", int, 0, 0),
+            warm_categories=parse_categories(environ, "WARM_CATEGORIES"),
+        )
+
+
+def parse_number(environ, name, cast, default, minimum):
+    raw = environ.get(name)
+    if raw is None or not str(raw).strip():
+        return default
+    try:
+        value = cast(raw)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {raw!r}") from None
+    if value < minimum:
+        raise ValueError(f"Invalid {name}: must be >= {minimum}")
+    return value
+
+
+def parse_flag(environ, name, default):
+    raw = environ.get(name)
+    if raw is None or not str(raw).strip():
+        return default
+    value = str(raw).strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"Invalid {name}: {raw!r}")
+
+
+def parse_categories(environ, name):
+    raw = environ.get(name) or ""
+    categories = [part.strip() for part in raw.split(",") if part.strip()]
+    unknown = [
+        category for category in categories if category not in CATEGORY_ORDER
+    ]
+    if unknown:
+        raise ValueError(f"Invalid {name}: unknown categories {unknown}")
+    return categories
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    # Only needed when settings are first read, not on import.
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return Settings.from_env()
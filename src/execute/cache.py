@@ -0,0 +1,97 @@
+# src/execute/cache.py
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.config.settings import get_settings
+from src.models.product import Product, dump_products
+
+
+def completeness_headers(products: list) -> dict:
+    """Rows parsed versus the `#product-count` reported by the page."""
+    parsed = len(products)
+    expected = max((product.total for product in products), default=0)
+    if not expected:
+        # The count could not be read, completeness cannot be claimed.
+        return {
+            "X-Products-Parsed": str(parsed),
+            "X-Products-Expected": "unknown",
+            "X-Products-Complete": "unknown",
+        }
+    return {
+        "X-Products-Parsed": str(parsed),
+        "X-Products-Expected": str(expected),
+        "X-Products-Complete": str(parsed >= expected).lower(),
+    }
+
+
+@dataclass
+class CacheEntry:
+    products: List[Product]
+    payload: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    stored_at: float = field(default_factory=time.monotonic)
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class ProductCache:
+    """Latest scrape per category, kept with its pre-serialized payload.
+
+    The payload and its headers are built once when the entry is stored,
+    so cache hits do no per-product work at all. The latest entry is kept
+    even after it expires so it can still be served as a stale snapshot.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        # Seconds a scrape is served from memory, 0 disables cache hits.
+        # Defaults to the CACHE_TTL setting, resolved on first use.
+        self._ttl = ttl
+        self._entries: Dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is None:
+            return get_settings().cache_ttl
+        return self._ttl
+
+    def put(self, category: str, products: List[Product]) -> CacheEntry:
+        entry = CacheEntry(
+            products=products,
+            payload=dump_products(products),
+            headers=completeness_headers(products),
+        )
+        with self._lock:
+            self._entries[category] = entry
+        logging.info(f"Cached {len(products)} products for {category}")
+        return entry
+
+    def latest(self, category: str) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(category)
+
+    def get(self, category: str) -> Optional[CacheEntry]:
+        entry = self.latest(category)
+        if entry is None or self.ttl <= 0 or entry.age() > self.ttl:
+            return None
+        return entry
+
+    def stale(self, category: str) -> Optional[CacheEntry]:
+        """Latest entry still young enough to answer when shedding load."""
+        entry = self.latest(category)
+        stale_ttl = get_settings().stale_ttl
+        if entry is None or stale_ttl <= 0 or entry.age() > stale_ttl:
+            return None
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+PRODUCT_CACHE = ProductCache()
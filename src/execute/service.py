@@ -1,46 +1,255 @@
 # src/executor/service.py
 import asyncio
 import logging
-import os
+import threading
 from concurrent.futures import ThreadPoolExecutor
-from typing import List
+from functools import lru_cache
+from typing import Callable, Iterator, List, Optional
 
-from dotenv import load_dotenv
+from src.config.settings import Settings, get_settings
+from src.models.product import EnrichedProduct, Product
+from src.models.site import DEFAULT_SITE, SiteProfile
+from src.storage.history import get_history_store
 
-from src.builder.pool import ScrapePool
-from src.models.product import Product
+logging.basicConfig(level=logging.INFO)
 
-load_dotenv()
 
-WORK_THREAD = int(os.environ.get("WORK_THREAD"))
+# Seconds a request may wait for a worker, by priority class.
+PRIORITY_TIMEOUTS = {"high": 5.0, "normal": 0.1, "low": 0.0}
 
-SCRAPER_SEMAPHORE = asyncio.Semaphore(value=WORK_THREAD)
 
+class AdmissionController:
+    """Scrape workers shared by every request, with priority classes.
+
+    High priority requests may take every worker and wait the longest,
+    normal and low priority leave `reserved` workers for them.
+    """
+
+    def __init__(self, capacity: int, reserved: int = 0):
+        self.capacity = capacity
+        self.reserved = min(reserved, capacity - 1)
+        self.in_use = 0
+        self.condition = asyncio.Condition()
+
+    def limit(self, priority: str) -> int:
+        if priority == "high":
+            return self.capacity
+        return self.capacity - self.reserved
+
+    def available(self) -> int:
+        return self.capacity - self.in_use
+
+    async def acquire(self, priority: str = "normal") -> bool:
+        limit = self.limit(priority)
+        async with self.condition:
+            if self.in_use >= limit:
+                timeout = PRIORITY_TIMEOUTS[priority]
+                if timeout <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(
+                        self.condition.wait_for(lambda: self.in_use < limit),
+                        timeout=timeout,
+                    )
+                except asyncio.TimeoutError:
+                    return False
+            self.in_use += 1
+            return True
+
+    async def release(self):
+        async with self.condition:
+            self.in_use -= 1
+            self.condition.notify_all()
+
+
+@lru_cache(maxsize=1)
+def get_admission() -> AdmissionController:
+    # Built on first use so importing the service reads no configuration.
+    settings = get_settings()
+    return AdmissionController(
+        capacity=settings.work_thread, reserved=settings.reserved_workers
+    )
 
-logging.basicConfig(level=logging.INFO)
+
+def get_site_profile(site: str) -> Optional[SiteProfile]:
+    from src.builder.profiles import get_site_registry
+
+    return get_site_registry().profile(site)
+
+
+@lru_cache(maxsize=None)
+def get_site_admission(site: str) -> AdmissionController:
+    """Workers one site may hold, so a slow site cannot take them all."""
+    return AdmissionController(capacity=get_site_profile(site).max_concurrency)
+
+
+def site_key(site: Optional[str], category: str) -> str:
+    """Cache and history key, the default site keeps bare categories."""
+    if site is None or site == DEFAULT_SITE:
+        return category
+    return f"{site}:{category}"
+
+
+def __getattr__(name: str):
+    # Former name of the admission gate.
+    if name == "SCRAPER_SEMAPHORE":
+        return get_admission()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class ExecuteService:
-    def __init__(self, category: str):
+    def __init__(
+        self,
+        category: str,
+        settings: Optional[Settings] = None,
+        site: Optional[str] = None,
+    ):
         self.category = category
-        self.size = int(os.environ.get("WORK_THREAD"))
-        self.pool = ScrapePool(size=self.size, category=self.category)
+        self.settings = settings or get_settings()
+        self.size = self.settings.work_thread
+        # None keeps the original scrape path of `/scrape`.
+        self.site = site
+        self.key = site_key(site, category)
+        self._pool = None
+        # Enrichment workers may open the session concurrently.
+        self.pool_lock = threading.Lock()
 
-    async def run(self) -> List[Product]:
-        try:
-            await asyncio.wait_for(SCRAPER_SEMAPHORE.acquire(), timeout=0.1)
-        except asyncio.TimeoutError:
+    @property
+    def pool(self):
+        # The browser session is only opened once a worker is admitted.
+        if self._pool is None:
+            # Selenium is only imported once a scrape is actually requested.
+            from src.builder.pool import ScrapePool
+            from src.builder.profiles import get_site_registry
+            from src.builder.sessions import get_session_pool
+
+            extractor = (
+                get_site_registry().extractor(self.site)
+                if self.site is not None
+                else None
+            )
+            self._pool = ScrapePool(
+                size=self.size,
+                category=self.category,
+                page_object=get_session_pool().acquire(
+                    self.category, site=extractor
+                ),
+            )
+        return self._pool
+
+    @property
+    def admission_site(self) -> str:
+        # `/scrape` has no site but is still bound by the default profile.
+        return self.site or DEFAULT_SITE
+
+    async def acquire_worker(self, priority: str = "normal"):
+        # The site budget is taken first, a busy site gives up before it
+        # holds one of the shared workers.
+        site = self.admission_site
+        site_admission = get_site_admission(site)
+        if not await site_admission.acquire(priority):
+            logging.info(f"Error no worker available for {site}")
+            raise RuntimeError("no_worker_available")
+        if not await get_admission().acquire(priority):
+            await site_admission.release()
             logging.info("Error no worker available")
             raise RuntimeError("no_worker_available")
+
+    async def release_worker(self):
+        await get_admission().release()
+        await get_site_admission(self.admission_site).release()
+
+    async def run(self, priority: str = "normal") -> List[Product]:
+        await self.acquire_worker(priority)
         try:
             loop = asyncio.get_event_loop()
             with ThreadPoolExecutor(self.size) as executor:
+                # Opening the session and writing the history both block,
+                # keep them off the event loop.
                 return await loop.run_in_executor(
-                    executor, self.pool.pool_with_threads
+                    executor, self.scrape_and_record
                 )
         finally:
-            SCRAPER_SEMAPHORE.release()
+            await self.release_worker()
+
+    def scrape_and_record(self) -> List[Product]:
+        products = self.scrape()
+        self.record_history(products)
+        return products
+
+    def record_history(self, products: List[Product]):
+        # The scrape already succeeded, a broken history must not lose it.
+        try:
+            get_history_store().record(self.key, products)
+        except Exception as e:
+            logging.error(f"Failed to record history of {self.key}: {e}")
+
+    def scrape(self) -> List[Product]:
+        if self.site is None:
+            return self.pool.pool_with_threads()
+        # Profiled sites read their rows in batches, one command per chunk.
+        return self.pool.extract()
+
+    def stream(self) -> Iterator[List[Product]]:
+        """Chunks of products as they are read, in bounded memory.
+
+        Call `acquire_worker` first and `release_worker` once consumed.
+        Streamed products are not cached nor added to the history.
+        """
+        return self.pool.stream(
+            maxsize=self.settings.stream_queue_size,
+            chunk_size=self.settings.scrape_chunk_size,
+        )
+
+    def enrich(self, products: List[Product]) -> Iterator[EnrichedProduct]:
+        """Fetch detail pages of the listed products, streamed as ready."""
+        from src.builder.enrichment import (
+            DetailEnricher,
+            get_detail_cache,
+            get_detail_http,
+            get_host_limits,
+        )
+
+        enricher = DetailEnricher(
+            http_client=get_detail_http(),
+            cache=get_detail_cache(),
+            host_limits=get_host_limits(),
+            browser_fetch=self.fetch_page_source,
+            workers=self.settings.enrich_workers,
+        )
+        return enricher.enrich(products)
+
+    def fetch_page_source(self, link: str) -> str:
+        # A browser session is only opened for pages rendered client side.
+        with self.pool_lock:
+            page_object = self.pool.page_object
+        return page_object.fetch_page_source(link)
+
+    def enrich_stream(
+        self, on_listed: Callable[[List[Product]], None]
+    ) -> Iterator[EnrichedProduct]:
+        """Enrich the listing chunk by chunk while it is still being read.
+
+        Call `acquire_worker` first and `release_worker` once consumed.
+        The full listing is recorded and passed to `on_listed` once read.
+        """
+        listed = []
+
+        def products():
+            for chunk in self.stream():
+                listed.extend(chunk)
+                yield from chunk
+            if listed:
+                self.record_history(listed)
+                on_listed(listed)
+
+        return self.enrich(products())
 
     def close(self):
         logging.info("Closing ExecuteService")
-        self.pool.close()
+        if self._pool is None:
+            return
+        from src.builder.sessions import get_session_pool
+
+        # Sessions beyond SESSION_POOL_SIZE are quit, the rest are reused.
+        get_session_pool().release(self._pool.page_object)
@@ -0,0 +1,159 @@
+# src/execute/warmup.py
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import Dict, List
+
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import get_settings
+from src.execute.cache import PRODUCT_CACHE
+from src.execute.service import ExecuteService
+
+logging.basicConfig(level=logging.INFO)
+
+# Category a pre-opened session is parked on.
+WARM_CATEGORY = "All Categories"
+
+# Seconds before a failed warm-up step is retried, doubled every attempt.
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+
+
+@dataclass
+class WarmupState:
+    done: bool = False
+    sessions: int = 0
+    # Last failure of every step still being retried.
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+class Warmup:
+    """Pre-opens browser sessions and pre-scrapes categories at startup.
+
+    Sessions beyond SESSION_POOL_SIZE would be quit on release, so at
+    most that many are opened. Failed steps are retried with backoff
+    until they succeed, a hub that comes up late still gets ready.
+    """
+
+    def __init__(
+        self,
+        sessions: int,
+        categories: List[str],
+        max_idle: int,
+        retry_delay: float = RETRY_DELAY,
+        max_retry_delay: float = MAX_RETRY_DELAY,
+    ):
+        self.sessions = min(sessions, max_idle)
+        self.categories = categories
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.state = WarmupState()
+        self.opened = []
+        if sessions > self.sessions:
+            logging.warning(
+                f"Warming {self.sessions} of {sessions} sessions, "
+                f"SESSION_POOL_SIZE is {max_idle}"
+            )
+
+    def open_session(self):
+        from src.builder.sessions import get_session_pool
+
+        pool = get_session_pool()
+        page_object = pool.acquire(WARM_CATEGORY)
+        try:
+            page_object.warm_up()
+        except Exception:
+            pool.discard(page_object)
+            raise
+        return page_object
+
+    async def open_sessions(self) -> bool:
+        """Open the sessions still missing, True once all are warm."""
+        from src.builder.sessions import get_session_pool
+
+        results = await asyncio.gather(
+            *(
+                run_in_threadpool(self.open_session)
+                for _ in range(self.sessions - len(self.opened))
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.fail("session", str(result))
+            else:
+                self.opened.append(result)
+        if len(self.opened) < self.sessions:
+            # Held back, released ones would be taken again by the retry.
+            return False
+        pool = get_session_pool()
+        # Released together so none of them is handed out half warm.
+        for page_object in self.opened:
+            pool.release(page_object)
+        self.state.sessions = len(self.opened)
+        self.opened = []
+        logging.info(f"Warmed {self.state.sessions} browser sessions")
+        return True
+
+    async def prime(self, category: str) -> bool:
+        service = ExecuteService(category=category)
+        try:
+            products = await service.run(priority="high")
+            if products:
+                PRODUCT_CACHE.put(category, products)
+                return True
+            self.fail(category, "no products")
+        except Exception as e:
+            self.fail(category, str(e))
+        finally:
+            await run_in_threadpool(service.close)
+        return False
+
+    def fail(self, step: str, error: str):
+        logging.error(f"Warm-up failed for {step}: {error}")
+        self.state.errors[step] = error
+
+    async def retry(self, step: str, attempt):
+        """Await `attempt` until it returns True, backing off in between."""
+        delay = self.retry_delay
+        while not await attempt():
+            logging.info(f"Retrying warm-up of {step} in {delay:g}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+        self.state.errors.pop(step, None)
+
+    async def run(self):
+        if self.sessions:
+            await self.retry("session", self.open_sessions)
+        for category in self.categories:
+            await self.retry(category, partial(self.prime, category))
+        self.state.done = True
+
+    def sessions_ready(self) -> bool:
+        if not self.sessions:
+            return True
+        if self.state.sessions < self.sessions:
+            return False
+        from src.builder.sessions import get_session_pool
+
+        # Warmed sessions may since have been recycled by the watchdog.
+        return get_session_pool().live() >= self.sessions
+
+    def cache_primed(self) -> bool:
+        return all(
+            PRODUCT_CACHE.latest(category) is not None
+            for category in self.categories
+        )
+
+
+@lru_cache(maxsize=1)
+def get_warmup() -> Warmup:
+    settings = get_settings()
+    return Warmup(
+        sessions=settings.warm_sessions,
+        categories=settings.warm_categories,
+        max_idle=settings.session_pool_size,
+    )
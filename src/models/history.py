@@ -0,0 +1,21 @@
+# src/models/history.py
+
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel, TypeAdapter
+
+
+class Observation(BaseModel):
+    scraped_at: datetime
+    price: float
+    stock_quantity: int
+    stock_status: str
+
+
+class ProductHistory(BaseModel):
+    link: str
+    observations: List[Observation]
+
+
+HISTORY_LIST_ADAPTER = TypeAdapter(List[ProductHistory])
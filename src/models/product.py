@@ -1,6 +1,8 @@
 # src/models/product.py
 
-from pydantic import BaseModel
+from typing import List
+
+from pydantic import BaseModel, TypeAdapter
 
 CATEGORY_ORDER = {
     "All Categories": 0,
@@ -18,3 +20,21 @@ class Product(BaseModel):
     stock_status: str
     stock_quantity: int
     total: int
+
+
+class ProductDetail(BaseModel):
+    description: str = ""
+    sku: str = ""
+    images: List[str] = []
+
+
+class EnrichedProduct(Product):
+    detail: ProductDetail
+
+
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[Product])
+
+
+def dump_products(products: List[Product]) -> bytes:
+    """Serialize a product list straight to JSON bytes in pydantic-core."""
+    return PRODUCT_LIST_ADAPTER.dump_json(products)
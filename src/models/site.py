@@ -0,0 +1,82 @@
+# src/models/site.py
+
+import re
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from src.models.product import CATEGORY_ORDER
+
+# Name of the profile built from the original site layout.
+DEFAULT_SITE = "default"
+
+
+class ColumnMap(BaseModel):
+    """Cell index of each field within a product row."""
+
+    title: int = Field(1, ge=0)
+    price: int = Field(3, ge=0)
+    stock: int = Field(4, ge=0)
+    link: int = Field(5, ge=0)
+
+
+class ParseRules(BaseModel):
+    price_strip: str = r"[^\d.]"
+    in_stock_text: str = "In Stock"
+    stock_quantity: str = r"\((\d+)\)"
+    min_columns: int = Field(6, ge=1)
+
+    @field_validator("price_strip", "stock_quantity")
+    @classmethod
+    def compiles(cls, pattern: str) -> str:
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern {pattern!r}: {e}") from None
+        return pattern
+
+
+class WaitBudget(BaseModel):
+    """Seconds allowed for elements, page loads and implicit lookups."""
+
+    element: float = Field(25, gt=0)
+    page_load: float = Field(30, gt=0)
+    implicit: float = Field(10, ge=0)
+
+
+class SiteProfile(BaseModel):
+    """Layout of one storefront, the defaults describe the original site.
+
+    `categories` maps each category to its position in the category
+    dropdown, the page is assumed to open on `default_category`.
+    """
+
+    name: str = Field(pattern=r"^[\w-]+$")
+    url: Optional[str] = None
+    table_selector: str = "#product-tbody"
+    row_selector: str = "#product-tbody tr"
+    link_selector: str = ".view-details-btn"
+    count_selector: str = "#product-count"
+    category_selector: str = "#category-filter"
+    categories: Dict[str, int] = Field(
+        default_factory=lambda: dict(CATEGORY_ORDER)
+    )
+    default_category: str = "All Categories"
+    columns: ColumnMap = ColumnMap()
+    parse: ParseRules = ParseRules()
+    waits: WaitBudget = WaitBudget()
+    max_concurrency: int = Field(1, ge=1)
+
+    @model_validator(mode="after")
+    def consistent(self) -> "SiteProfile":
+        if self.default_category not in self.categories:
+            raise ValueError(
+                f"Default category {self.default_category!r} of "
+                f"{self.name} is not in its categories"
+            )
+        if max(self.columns.model_dump().values()) >= self.parse.min_columns:
+            raise ValueError(
+                f"Columns of {self.name} exceed min_columns "
+                f"{self.parse.min_columns}"
+            )
+        return self
@@ -0,0 +1,58 @@
+# src/monitoring/metrics.py
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Metrics:
+    """Counters and gauges rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self.counters: Dict[str, Dict[Labels, float]] = defaultdict(dict)
+        self.gauges: Dict[str, Callable[[], float]] = {}
+        self.help: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def value(self, name: str, **labels: str) -> float:
+        with self.lock:
+            return self.counters[name].get(tuple(sorted(labels.items())), 0)
+
+    def gauge(self, name: str, read: Callable[[], float], text: str = ""):
+        self.gauges[name] = read
+        self.help[name] = text
+
+    def describe(self, name: str, text: str):
+        self.help[name] = text
+
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            counters = {
+                name: dict(series) for name, series in self.counters.items()
+            }
+        for name, series in sorted(counters.items()):
+            if name in self.help:
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{name}{suffix} {value:g}")
+        for name, read in sorted(self.gauges.items()):
+            if self.help.get(name):
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {read():g}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
@@ -0,0 +1,326 @@
+# src/storage/history.py
+
+import logging
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from src.config.settings import get_settings
+from src.models.history import Observation, ProductHistory
+from src.models.product import Product
+
+logging.basicConfig(level=logging.INFO)
+
+# Observations per chunk, a sealed chunk is never written again.
+CHUNK_SIZE = 4096
+
+STOCK_STATUSES = ["Out of Stock", "In Stock"]
+
+# Append-only log records: interned strings and observations.
+STRING_RECORD = struct.Struct("<cIH")
+OBSERVATION_RECORD = struct.Struct("<cIIqdiB")
+
+
+class RunLengthColumn:
+    """Values that rarely change, stored once per run."""
+
+    def __init__(self, typecode: str):
+        self.values = array(typecode)
+        self.ends = array("I")
+
+    def __len__(self) -> int:
+        return self.ends[-1] if self.ends else 0
+
+    def append(self, value):
+        if self.values and self.values[-1] == value:
+            self.ends[-1] += 1
+        else:
+            self.values.append(value)
+            self.ends.append(len(self) + 1)
+
+    def slice(self, start: int, stop: int) -> Iterator:
+        run = bisect_right(self.ends, start)
+        index = start
+        while index < stop:
+            end = min(self.ends[run], stop)
+            value = self.values[run]
+            for _ in range(end - index):
+                yield value
+            index = end
+            run += 1
+
+
+class Chunk:
+    def __init__(self):
+        self.timestamps = array("q")
+        self.prices = RunLengthColumn("d")
+        self.quantities = RunLengthColumn("i")
+        self.statuses = RunLengthColumn("B")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(self, timestamp: int, price, quantity, status):
+        self.timestamps.append(timestamp)
+        self.prices.append(price)
+        self.quantities.append(quantity)
+        self.statuses.append(status)
+
+    def rows(self, start_ms: int, end_ms: int) -> Iterator[Tuple]:
+        start = bisect_left(self.timestamps, start_ms)
+        stop = bisect_right(self.timestamps, end_ms)
+        return zip(
+            self.timestamps[start:stop],
+            self.prices.slice(start, stop),
+            self.quantities.slice(start, stop),
+            self.statuses.slice(start, stop),
+        )
+
+
+class Series:
+    """Observations of one product link, in time order."""
+
+    def __init__(self):
+        self.chunks: List[Chunk] = [Chunk()]
+        self.first_timestamps = array("q")
+        self.last_timestamp = None
+
+    def append(self, timestamp: int, price, quantity, status):
+        # Keep timestamps sorted even if the clock steps backwards.
+        if self.last_timestamp is not None:
+            timestamp = max(timestamp, self.last_timestamp)
+        self.last_timestamp = timestamp
+        chunk = self.chunks[-1]
+        if len(chunk) >= CHUNK_SIZE:
+            chunk = Chunk()
+            self.chunks.append(chunk)
+        if not len(chunk):
+            self.first_timestamps.append(timestamp)
+        chunk.append(timestamp, price, quantity, status)
+
+    def rows(self, start_ms: int, end_ms: int) -> Iterator[Tuple]:
+        first = max(bisect_right(self.first_timestamps, start_ms) - 1, 0)
+        for chunk in self.chunks[first:]:
+            if len(chunk) and chunk.timestamps[0] > end_ms:
+                break
+            yield from chunk.rows(start_ms, end_ms)
+
+
+def to_ms(moment: Optional[datetime], default: int) -> int:
+    if moment is None:
+        return default
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def downsample(rows: Iterator[Tuple], interval_ms: int) -> Iterator[Tuple]:
+    """Keep the last observation of every interval."""
+    last_bucket, last_row = None, None
+    for row in rows:
+        bucket = row[0] // interval_ms
+        if last_bucket is not None and bucket != last_bucket:
+            yield last_row
+        last_bucket, last_row = bucket, row
+    if last_row is not None:
+        yield last_row
+
+
+class HistoryStore:
+    """Append-only price and stock history per product link.
+
+    Timestamps are kept in array-backed chunks for binary search, and
+    price, quantity and status are run-length encoded since they rarely
+    change between scrapes. With a path, every observation is also
+    appended to a compact binary log that is replayed on start.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.series: Dict[str, Series] = {}
+        self.categories: Dict[str, Set[str]] = {}
+        self.strings: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.log = None
+        if path:
+            if os.path.exists(path):
+                self.load(path)
+            self.log = open(path, "ab")
+
+    def load(self, path: str):
+        try:
+            complete = self.replay(path)
+        except ValueError as e:
+            # Later records may still be intact, keep the file for recovery.
+            aside = f"{path}.corrupt-{int(time.time())}"
+            logging.error(f"{e}, moved {path} to {aside}")
+            os.replace(path, aside)
+            self.series, self.categories, self.strings = {}, {}, {}
+            return
+        dropped = os.path.getsize(path) - complete
+        if dropped:
+            # New records must not follow a partial one.
+            logging.warning(
+                f"Dropping {dropped} incomplete bytes at the end of {path}"
+            )
+            os.truncate(path, complete)
+
+    def intern(self, value: str, records: list) -> int:
+        string_id = self.strings.get(value)
+        if string_id is None:
+            string_id = self.strings[value] = len(self.strings)
+            data = value.encode()
+            records.append(STRING_RECORD.pack(b"S", string_id, len(data)))
+            records.append(data)
+        return string_id
+
+    def add(self, category: str, link: str, row: Tuple):
+        """Append a (timestamp, price, quantity, status) row."""
+        self.categories.setdefault(category, set()).add(link)
+        series = self.series.get(link)
+        if series is None:
+            series = self.series[link] = Series()
+        series.append(*row)
+
+    def record(
+        self,
+        category: str,
+        products: List[Product],
+        scraped_at: Optional[float] = None,
+    ):
+        timestamp = int((scraped_at or time.time()) * 1000)
+        records, seen = [], set()
+        with self.lock:
+            category_id = self.intern(category, records)
+            for product in products:
+                # A link listed twice in one scrape is one observation.
+                if not product.link or product.link in seen:
+                    continue
+                seen.add(product.link)
+                status = STOCK_STATUSES.index(product.stock_status)
+                self.add(
+                    category,
+                    product.link,
+                    (timestamp, product.price, product.stock_quantity, status),
+                )
+                if self.log is not None:
+                    records.append(
+                        OBSERVATION_RECORD.pack(
+                            b"O",
+                            self.intern(product.link, records),
+                            category_id,
+                            timestamp,
+                            product.price,
+                            product.stock_quantity,
+                            status,
+                        )
+                    )
+            if self.log is not None:
+                self.log.write(b"".join(records))
+                self.log.flush()
+
+    def replay(self, path: str) -> int:
+        """Load the log, returns the length of its complete records.
+
+        A crash mid-write leaves a partial record at the end, replay stops
+        at the last complete one. Any other damage raises ValueError.
+        """
+        names = {}
+        with open(path, "rb") as log:
+            data = log.read()
+        offset = 0
+        while offset < len(data):
+            kind = data[offset : offset + 1]
+            try:
+                if kind == b"S":
+                    if len(data) - offset < STRING_RECORD.size:
+                        break
+                    _, string_id, size = STRING_RECORD.unpack_from(
+                        data, offset
+                    )
+                    start = offset + STRING_RECORD.size
+                    if len(data) - start < size:
+                        break
+                    value = data[start : start + size].decode()
+                    offset = start + size
+                    names[string_id] = value
+                    self.strings[value] = string_id
+                elif kind == b"O":
+                    if len(data) - offset < OBSERVATION_RECORD.size:
+                        break
+                    _, link, category, timestamp, price, quantity, status = (
+                        OBSERVATION_RECORD.unpack_from(data, offset)
+                    )
+                    self.add(
+                        names[category],
+                        names[link],
+                        (timestamp, price, quantity, status),
+                    )
+                    offset += OBSERVATION_RECORD.size
+                else:
+                    raise ValueError(f"Unknown record {kind!r}")
+            except (KeyError, UnicodeDecodeError, ValueError) as e:
+                raise ValueError(
+                    f"Corrupt history log at byte {offset}: {e}"
+                ) from None
+        logging.info(f"Replayed history of {len(self.series)} products")
+        return offset
+
+    def product_history(
+        self,
+        link: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        interval: Optional[float] = None,
+    ) -> Optional[ProductHistory]:
+        series = self.series.get(link)
+        if series is None:
+            return None
+        with self.lock:
+            rows = list(series.rows(to_ms(start, 0), to_ms(end, 2**63 - 1)))
+        if interval:
+            rows = downsample(iter(rows), max(int(interval * 1000), 1))
+        return ProductHistory(
+            link=link,
+            observations=[
+                Observation(
+                    scraped_at=datetime.fromtimestamp(
+                        timestamp / 1000, tz=timezone.utc
+                    ),
+                    price=price,
+                    stock_quantity=quantity,
+                    stock_status=STOCK_STATUSES[status],
+                )
+                for timestamp, price, quantity, status in rows
+            ],
+        )
+
+    def category_history(
+        self,
+        category: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        interval: Optional[float] = None,
+    ) -> List[ProductHistory]:
+        with self.lock:
+            links = sorted(self.categories.get(category, ()))
+        histories = (
+            self.product_history(link, start, end, interval) for link in links
+        )
+        return [history for history in histories if history.observations]
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+
+@lru_cache(maxsize=1)
+def get_history_store() -> HistoryStore:
+    return HistoryStore(path=get_settings().history_path)
@@ -0,0 +1,89 @@
+# src/storage/reparse.py
+"""Rebuild products from stored snapshots without a browser.
+
+Run with: python -m src.storage.reparse SNAPSHOT_DIR [--category NAME]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Tuple
+
+from src.models.product import Product
+from src.models.site import DEFAULT_SITE
+from src.storage.snapshot import SnapshotStore, load_object, parse_snapshot
+
+logging.basicConfig(level=logging.INFO)
+
+
+def reparse_object(
+    path: str, expected_count: Optional[int], page_url: Optional[str]
+) -> List[Product]:
+    return parse_snapshot(load_object(path), expected_count, page_url)
+
+
+def reparse(
+    store: SnapshotStore,
+    category: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[dict, List[Product]]]:
+    """Yield every index entry with its products, parsed across cores.
+
+    Identical snapshots are parsed once and shared by their entries, each
+    snapshot is yielded as soon as it is parsed. Only captures of the
+    default site layout are re-parsed.
+    """
+    # Only the index entries are held, never the whole parsed corpus.
+    unique = {}
+    for entry in store.entries(category, site=DEFAULT_SITE):
+        unique.setdefault((entry["hash"], entry.get("page_url")), []).append(
+            entry
+        )
+
+    with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(
+                reparse_object,
+                store.object_path(digest),
+                captures[0].get("expected_count"),
+                page_url,
+            ): captures
+            for (digest, page_url), captures in unique.items()
+        }
+        for future in as_completed(futures):
+            products = future.result()
+            for entry in futures.pop(future):
+                yield entry, products
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("snapshot_dir")
+    parser.add_argument("--category")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.snapshot_dir)
+    total = 0
+    for entry, products in reparse(store, args.category, args.workers):
+        for product in products:
+            row = {
+                "hash": entry["hash"],
+                "category": entry["category"],
+                "captured_at": entry["captured_at"],
+                **product.model_dump(),
+            }
+            sys.stdout.write(json.dumps(row) + "\n")
+        total += len(products)
+        logging.info(
+            f"{entry['hash'][:12]} {entry['category']}: "
+            f"{len(products)} of {entry.get('expected_count')} products"
+        )
+    logging.info(f"Re-parsed {total} products")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# src/storage/snapshot.py
+
+import gzip
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Iterator, List, Optional
+from urllib.parse import urljoin
+
+from src.builder.parsing import MINIMUM_COLUMN_COUNT, product_from_cells
+from src.config.settings import get_settings
+from src.models.product import Product
+from src.models.site import DEFAULT_SITE
+
+logging.basicConfig(level=logging.INFO)
+
+INDEX_FILE = "index.jsonl"
+OBJECTS_DIR = "objects"
+
+
+class TableParser(HTMLParser):
+    """Rows of a `#product-tbody` snapshot as (cell texts, link) pairs."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self.cells = None
+        self.text = None
+        self.link = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self.cells, self.link = [], None
+        elif tag == "td" and self.cells is not None:
+            self.text = []
+        elif tag == "a" and self.cells is not None:
+            attrs = dict(attrs)
+            if "view-details-btn" in (attrs.get("class") or "").split():
+                self.link = attrs.get("href")
+
+    def handle_endtag(self, tag):
+        if tag == "td" and self.text is not None:
+            self.cells.append(" ".join("".join(self.text).split()))
+            self.text = None
+        elif tag == "tr" and self.cells is not None:
+            self.rows.append((self.cells, self.link))
+            self.cells = None
+
+    def handle_data(self, data):
+        if self.text is not None:
+            self.text.append(data)
+
+
+def parse_snapshot(
+    html: str, expected_count: Optional[int], page_url: Optional[str] = None
+) -> List[Product]:
+    """Rebuild products from a stored table with the scraper's rules.
+
+    Links are resolved against `page_url` as the browser resolves them.
+    """
+    parser = TableParser()
+    parser.feed(html)
+    parser.close()
+    products = []
+    for index, (cells, link) in enumerate(parser.rows):
+        if len(cells) < MINIMUM_COLUMN_COUNT:
+            continue
+        href = urljoin(page_url, link) if link and page_url else link
+        try:
+            products.append(
+                product_from_cells(cells, href, total=expected_count or 0)
+            )
+        except Exception as e:
+            logging.error(f"Failed to re-parse row {index}: {e}")
+    return products
+
+
+class SnapshotStore:
+    """Raw `#product-tbody` HTML of each scrape, gzip compressed and
+    stored once per content hash, with an append-only index of captures.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(root, OBJECTS_DIR), exist_ok=True)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(
+            self.root, OBJECTS_DIR, digest[:2], f"{digest}.html.gz"
+        )
+
+    def save(
+        self,
+        category: str,
+        html: str,
+        expected_count: Optional[int],
+        site: str = DEFAULT_SITE,
+        page_url: Optional[str] = None,
+    ) -> str:
+        data = html.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as output:
+                output.write(gzip.compress(data))
+            os.replace(temporary, path)
+        entry = {
+            "hash": digest,
+            "site": site,
+            "category": category,
+            "expected_count": expected_count,
+            "page_url": page_url,
+            "captured_at": time.time(),
+        }
+        with self.lock:
+            with open(os.path.join(self.root, INDEX_FILE), "a") as index:
+                index.write(json.dumps(entry) + "\n")
+        return digest
+
+    def entries(
+        self, category: Optional[str] = None, site: Optional[str] = None
+    ) -> Iterator[dict]:
+        path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path) as index:
+            for line in index:
+                entry = json.loads(line)
+                if category is not None and entry["category"] != category:
+                    continue
+                # Captures older than site profiles are all of the default.
+                if (
+                    site is not None
+                    and entry.get("site", DEFAULT_SITE) != site
+                ):
+                    continue
+                yield entry
+
+    def load(self, digest: str) -> str:
+        return load_object(self.object_path(digest))
+
+
+def load_object(path: str) -> str:
+    # Decompress straight from the mapped file, no intermediate read.
+    with open(path, "rb") as source:
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return gzip.decompress(data).decode()
+
+
+@lru_cache(maxsize=1)
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    snapshot_dir = get_settings().snapshot_dir
+    return SnapshotStore(snapshot_dir) if snapshot_dir else None
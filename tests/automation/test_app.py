@@ -1,15 +1,21 @@
 # tests/automation/test_app.py
 
+import json
 import os
-from unittest.mock import AsyncMock, patch
+import subprocess
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from dotenv import load_dotenv
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
-from src.automation.app import app
-from src.models.product import Product
+from src.automation.app import app, close_resources
+from src.execute.cache import ProductCache
+from src.execute.warmup import Warmup
+from src.models.product import EnrichedProduct, Product, ProductDetail
+from src.storage.history import HistoryStore
 
 load_dotenv()
 
@@ -24,6 +30,8 @@ STATUS_CODE_OK = 200
 STATUS_INVALID_CATEGORY = 422
 STATUS_NO_WORKER_AVAILABLE = 429
 STATUS_NOT_FOUND = 404
+STREAMED_LINES = 2
+STATUS_NOT_READY = 503
 
 
 def test_scrape_valid_category_success():
@@ -58,10 +66,231 @@ def test_scrape_valid_category_success():
                 "total": 50,
             }
         ]
+        assert response.headers["X-Products-Parsed"] == "1"
+        assert response.headers["X-Products-Expected"] == "50"
+        assert response.headers["X-Products-Complete"] == "false"
         mock_service.assert_called_once_with(category=category)
         mock_service_instance.run.assert_awaited_once()
 
 
+def test_scrape_cache_hit_skips_service():
+    # Arrange
+    category = "Apparel"
+    cache = ProductCache(ttl=60)
+    entry = cache.put(
+        category,
+        [
+            Product(
+                title="Cached Product",
+                price=1.5,
+                link="https://example.com/cached",
+                stock_status="Out of Stock",
+                stock_quantity=0,
+                total=1,
+            )
+        ],
+    )
+    with (
+        patch("src.automation.app.PRODUCT_CACHE", cache),
+        patch("src.automation.app.ExecuteService") as mock_service,
+    ):
+        # Act
+        response = client.get(f"/scrape?category={category}")
+
+    # Assert
+    assert response.status_code == STATUS_CODE_OK
+    assert response.content == entry.payload
+    assert response.headers["X-Cache"] == "hit"
+    assert response.headers["X-Products-Complete"] == "true"
+    mock_service.assert_not_called()
+
+
+def test_import_does_not_load_selenium():
+    # Selenium is loaded lazily, importing the API must stay cheap.
+    code = (
+        "import sys, src.automation.app; "
+        "assert 'selenium' not in sys.modules; "
+        "assert 'dotenv' not in sys.modules; "
+        "assert 'urllib3' not in sys.modules"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "WORK_THREAD"}
+
+    result = subprocess.run([sys.executable, "-c", code], env=env, check=False)
+
+    assert result.returncode == 0
+
+
+def test_history_endpoints():
+    # Arrange
+    store = HistoryStore()
+    product = Product(
+        title="Test Product",
+        price=99.99,
+        link="https://example.com",
+        stock_status="In Stock",
+        stock_quantity=10,
+        total=50,
+    )
+    store.record("Electronics", [product], scraped_at=1_700_000_000)
+    with patch("src.automation.app.get_history_store", return_value=store):
+        # Act
+        by_product = client.get("/history/product?link=https://example.com")
+        by_category = client.get("/history/category?category=Electronics")
+        missing = client.get("/history/product?link=https://missing.com")
+
+    # Assert
+    assert by_product.status_code == STATUS_CODE_OK
+    assert by_product.json()["observations"] == [
+        {
+            "scraped_at": "2023-11-14T22:13:20Z",
+            "price": 99.99,
+            "stock_quantity": 10,
+            "stock_status": "In Stock",
+        }
+    ]
+    assert [h["link"] for h in by_category.json()] == ["https://example.com"]
+    assert missing.status_code == STATUS_NOT_FOUND
+
+
+def test_scrape_enriched_streams_ndjson():
+    # Arrange
+    category = "Electronics"
+    product = Product(
+        title="Test Product",
+        price=99.99,
+        link="https://example.com",
+        stock_status="In Stock",
+        stock_quantity=10,
+        total=50,
+    )
+    enriched = EnrichedProduct(
+        **product.model_dump(), detail=ProductDetail(sku="AB-1")
+    )
+    with (
+        patch("src.automation.app.PRODUCT_CACHE", ProductCache(ttl=0)),
+        patch("src.automation.app.ExecuteService") as mock_service,
+    ):
+        mock_service_instance = mock_service.return_value
+        mock_service_instance.acquire_worker = AsyncMock()
+        mock_service_instance.release_worker = AsyncMock()
+        mock_service_instance.enrich_stream.return_value = iter([enriched])
+
+        # Act
+        response = client.get(f"/scrape/enriched?category={category}")
+
+    # Assert
+    assert response.status_code == STATUS_CODE_OK
+    [line] = response.text.splitlines()
+    assert json.loads(line)["detail"]["sku"] == "AB-1"
+    mock_service_instance.enrich_stream.assert_called_once()
+    mock_service_instance.release_worker.assert_awaited_once()
+    mock_service_instance.close.assert_called_once()
+
+
+def test_scrape_enriched_empty_listing_not_found():
+    # Arrange
+    category = "Electronics"
+    with (
+        patch("src.automation.app.PRODUCT_CACHE", ProductCache(ttl=0)),
+        patch("src.automation.app.ExecuteService") as mock_service,
+    ):
+        mock_service_instance = mock_service.return_value
+        mock_service_instance.acquire_worker = AsyncMock()
+        mock_service_instance.release_worker = AsyncMock()
+        mock_service_instance.enrich_stream.return_value = iter([])
+
+        # Act
+        response = client.get(f"/scrape/enriched?category={category}")
+
+    # Assert
+    assert response.status_code == STATUS_NOT_FOUND
+    mock_service_instance.release_worker.assert_awaited_once()
+    mock_service_instance.close.assert_called_once()
+
+
+def test_scrape_stream_releases_worker():
+    # Arrange
+    category = "Electronics"
+    product = Product(
+        title="Test Product",
+        price=99.99,
+        link="https://example.com",
+        stock_status="In Stock",
+        stock_quantity=10,
+        total=50,
+    )
+    with patch("src.automation.app.ExecuteService") as mock_service:
+        mock_service_instance = mock_service.return_value
+        mock_service_instance.acquire_worker = AsyncMock()
+        mock_service_instance.release_worker = AsyncMock()
+        mock_service_instance.stream.return_value = iter(
+            [[product], [product]]
+        )
+
+        # Act
+        response = client.get(f"/scrape/stream?category={category}")
+
+    # Assert
+    assert response.status_code == STATUS_CODE_OK
+    assert len(response.text.splitlines()) == STREAMED_LINES
+    mock_service_instance.acquire_worker.assert_awaited_once_with(
+        priority="normal"
+    )
+    mock_service_instance.release_worker.assert_awaited_once()
+    mock_service_instance.close.assert_called_once()
+
+
+def test_scrape_enriched_admits_before_enriching_a_cached_listing():
+    # Arrange
+    category = "Electronics"
+    product = Product(
+        title="Test Product",
+        price=99.99,
+        link="https://example.com",
+        stock_status="In Stock",
+        stock_quantity=10,
+        total=50,
+    )
+    cache = ProductCache(ttl=60)
+    cache.put(category, [product])
+    with (
+        patch("src.automation.app.PRODUCT_CACHE", cache),
+        patch("src.automation.app.ExecuteService") as mock_service,
+    ):
+        mock_service_instance = mock_service.return_value
+        mock_service_instance.acquire_worker = AsyncMock(
+            side_effect=RuntimeError("no_worker_available")
+        )
+
+        # Act
+        response = client.get(f"/scrape/enriched?category={category}")
+
+    # Assert
+    assert response.status_code == STATUS_NO_WORKER_AVAILABLE
+    assert int(response.headers["Retry-After"]) >= 1
+    mock_service_instance.enrich.assert_not_called()
+    mock_service_instance.close.assert_called_once()
+
+
+def test_scrape_stream_no_worker_available_sets_retry_after():
+    # Arrange
+    category = "Electronics"
+    with patch("src.automation.app.ExecuteService") as mock_service:
+        mock_service_instance = mock_service.return_value
+        mock_service_instance.acquire_worker = AsyncMock(
+            side_effect=RuntimeError("no_worker_available")
+        )
+
+        # Act
+        response = client.get(f"/scrape/stream?category={category}")
+
+    # Assert
+    assert response.status_code == STATUS_NO_WORKER_AVAILABLE
+    assert response.json() == {"detail": "no worker available"}
+    assert int(response.headers["Retry-After"]) >= 1
+    mock_service_instance.stream.assert_not_called()
+
+
 def test_scrape_invalid_category():
     # Arrange
     category = "Invalid Category"
@@ -170,3 +399,153 @@ async def test_scrape_integration_valid_category():
         ]
         mock_service.assert_called_once_with(category=category)
         mock_service_instance.run.assert_awaited_once()
+
+
+def test_metrics_exposes_session_recycles():
+    # Arrange
+    from src.monitoring.metrics import METRICS
+
+    METRICS.inc("scraper_session_recycles_total", reason="age")
+
+    # Act
+    response = client.get("/metrics")
+
+    # Assert
+    assert response.status_code == STATUS_CODE_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'scraper_session_recycles_total{reason="age"}' in response.text
+
+
+def test_site_scrape_unknown_site_returns_404():
+    response = client.get("/sites/nowhere/scrape?category=Apparel")
+
+    assert response.status_code == STATUS_NOT_FOUND
+    assert response.json() == {"message_id": "Site not found"}
+
+
+def test_site_scrape_unknown_category_returns_404():
+    response = client.get("/sites/default/scrape?category=Garden")
+
+    assert response.status_code == STATUS_NOT_FOUND
+    assert response.json() == {"message_id": "Category not found"}
+
+
+def test_site_scrape_runs_service_for_site():
+    # Arrange
+    product = Product(
+        title="Site Product",
+        price=1.0,
+        link="https://example.com/site",
+        stock_status="In Stock",
+        stock_quantity=1,
+        total=1,
+    )
+    cache = ProductCache(ttl=60)
+    with (
+        patch("src.automation.app.ExecuteService") as mock_service,
+        patch("src.automation.app.PRODUCT_CACHE", cache),
+    ):
+        mock_service.return_value.run = AsyncMock(return_value=[product])
+
+        # Act
+        response = client.get("/sites/default/scrape?category=Apparel")
+
+    # Assert
+    assert response.status_code == STATUS_CODE_OK
+    assert response.json()[0]["title"] == "Site Product"
+    mock_service.assert_called_once_with(category="Apparel", site="default")
+    assert cache.get("Apparel") is not None
+
+
+def test_healthz_reports_alive():
+    response = client.get("/healthz")
+
+    assert response.status_code == STATUS_CODE_OK
+    assert response.json() == {"status": "ok"}
+
+
+def test_shutdown_quits_pooled_sessions_and_closes_history():
+    # Arrange
+    warmup = Warmup(sessions=1, categories=[], max_idle=1)
+    held = MagicMock()
+    warmup.opened.append(held)
+    pool = MagicMock()
+    store = MagicMock()
+    with (
+        patch("src.automation.app.get_warmup", return_value=warmup),
+        patch("src.builder.sessions.get_session_pool") as get_session_pool,
+        patch("src.automation.app.get_history_store") as get_history_store,
+    ):
+        get_session_pool.return_value = pool
+        get_history_store.return_value = store
+
+        # Act
+        close_resources()
+
+    # Assert
+    held.close.assert_called_once()
+    pool.close.assert_called_once()
+    store.close.assert_called_once()
+
+
+def test_readyz_waits_for_warmup():
+    # Arrange
+    warmup = Warmup(sessions=1, categories=[], max_idle=1)
+    with (
+        patch("src.automation.app.get_warmup", return_value=warmup),
+        patch("src.automation.app.hub_ready", return_value=True),
+        patch("src.automation.app.get_settings") as mock_settings,
+    ):
+        mock_settings.return_value.hub_selenium = "http://hub:4444/wd/hub"
+
+        # Act
+        response = client.get("/readyz")
+
+    # Assert
+    assert response.status_code == STATUS_NOT_READY
+    assert response.json()["checks"] == {
+        "hub": True,
+        "sessions": False,
+        "cache": True,
+    }
+
+
+def test_readyz_ready_once_warm_and_hub_up():
+    warmup = Warmup(sessions=0, categories=["Apparel"], max_idle=0)
+    warmup.state.done = True
+    cache = ProductCache(ttl=0)
+    cache.put("Apparel", [])
+    with (
+        patch("src.automation.app.get_warmup", return_value=warmup),
+        patch("src.automation.app.hub_ready", return_value=True),
+        patch("src.automation.app.get_settings") as mock_settings,
+        patch("src.execute.warmup.PRODUCT_CACHE", cache),
+    ):
+        mock_settings.return_value.hub_selenium = "http://hub:4444/wd/hub"
+
+        response = client.get("/readyz")
+
+    assert response.status_code == STATUS_CODE_OK
+    assert response.json()["ready"] is True
+
+
+def test_completeness_is_unknown_without_product_count():
+    cache = ProductCache(ttl=60)
+    cache.put(
+        "Apparel",
+        [
+            Product(
+                title="Uncounted Product",
+                price=1.0,
+                link="https://example.com/uncounted",
+                stock_status="In Stock",
+                stock_quantity=1,
+                total=0,
+            )
+        ],
+    )
+    with patch("src.automation.app.PRODUCT_CACHE", cache):
+        response = client.get("/scrape?category=Apparel")
+
+    assert response.headers["X-Products-Expected"] == "unknown"
+    assert response.headers["X-Products-Complete"] == "unknown"
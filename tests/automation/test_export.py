@@ -0,0 +1,130 @@
+# tests/automation/test_export.py
+
+import csv
+import gzip
+import io
+import json
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.automation.app import app
+from src.automation.export import (
+    export_stream,
+    iter_columnar,
+    iter_csv,
+    iter_json,
+    iter_ndjson,
+    negotiate_encoding,
+)
+from src.execute.cache import ProductCache
+from src.models.product import Product
+
+client = TestClient(app)
+
+STATUS_CODE_OK = 200
+STATUS_NOT_FOUND = 404
+STATUS_NOT_IMPLEMENTED = 501
+PRODUCTS = 2500
+
+
+def make_products(count: int = PRODUCTS):
+    return [
+        Product(
+            title=f"Product {index}",
+            price=index + 0.5,
+            link=f"https://example.com/{index}",
+            stock_status="In Stock",
+            stock_quantity=index,
+            total=count,
+        )
+        for index in range(count)
+    ]
+
+
+def test_iter_json_splices_chunks():
+    products = make_products()
+
+    body = b"".join(iter_json(products))
+
+    assert json.loads(body) == [product.model_dump() for product in products]
+
+
+def test_iter_json_empty():
+    assert json.loads(b"".join(iter_json([]))) == []
+
+
+def test_iter_ndjson_one_product_per_line():
+    products = make_products(3)
+
+    lines = b"".join(iter_ndjson(products)).splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        product.model_dump() for product in products
+    ]
+
+
+def test_iter_columnar_one_array_per_field():
+    products = make_products(3)
+
+    body = json.loads(b"".join(iter_columnar(products)))
+
+    assert body["title"] == ["Product 0", "Product 1", "Product 2"]
+    assert body["stock_quantity"] == [0, 1, 2]
+
+
+def test_iter_csv_has_header_and_rows():
+    products = make_products()
+
+    rows = list(csv.reader(io.StringIO(b"".join(iter_csv(products)).decode())))
+
+    assert rows[0] == list(Product.model_fields)
+    assert len(rows) == PRODUCTS + 1
+    assert rows[1][0] == "Product 0"
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("*") is not None
+
+
+def test_export_stream_gzip_roundtrip():
+    products = make_products()
+
+    body = gzip.decompress(b"".join(export_stream(products, "json", "gzip")))
+
+    assert len(json.loads(body)) == PRODUCTS
+
+
+def test_export_endpoint_streams_latest_snapshot():
+    cache = ProductCache(ttl=0)
+    cache.put("Apparel", make_products(3))
+
+    with patch("src.automation.app.PRODUCT_CACHE", cache):
+        response = client.get(
+            "/export?category=Apparel&format=csv",
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+    assert response.status_code == STATUS_CODE_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert "apparel.csv" in response.headers["content-disposition"]
+    assert response.text.startswith("title,price,link")
+
+
+def test_export_endpoint_without_snapshot():
+    with patch("src.automation.app.PRODUCT_CACHE", ProductCache()):
+        response = client.get("/export?category=Apparel")
+
+    assert response.status_code == STATUS_NOT_FOUND
+    assert response.json() == {"message_id": "Snapshot not found"}
+
+
+def test_export_endpoint_parquet_requires_pyarrow():
+    with patch("src.automation.app.format_available", return_value=False):
+        response = client.get("/export?category=Apparel&format=parquet")
+
+    assert response.status_code == STATUS_NOT_IMPLEMENTED
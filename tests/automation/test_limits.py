@@ -0,0 +1,206 @@
+# tests/automation/test_limits.py
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.automation.app import app
+from src.automation.limits import RateLimiter, TokenBucket
+from src.config.settings import Settings
+from src.execute.cache import ProductCache
+from src.execute.service import AdmissionController, ExecuteService
+from src.models.product import Product
+from src.models.site import SiteProfile
+from src.storage.history import HistoryStore
+
+STATUS_CODE_OK = 200
+STATUS_TOO_MANY_REQUESTS = 429
+BURST = 20
+SCRAPE_COST = 10
+NOISY_REQUESTS = 10
+WORKERS = 2
+SCRAPE_SECONDS = 0.05
+SLOW_SITE_SECONDS = 0.3
+SLOW_SITE_REQUESTS = 3
+
+
+class FakeScrapePool:
+    """Stands in for the browser scrape, only takes time."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def pool_with_threads(self):
+        self.calls += 1
+        time.sleep(SCRAPE_SECONDS)
+        return [
+            Product(
+                title="Fake Product",
+                price=1.0,
+                link="https://example.com/fake",
+                stock_status="In Stock",
+                stock_quantity=1,
+                total=1,
+            )
+        ]
+
+    def extract(self):
+        # Profiled sites scrape through the batch path, this one is slow.
+        self.calls += 1
+        time.sleep(SLOW_SITE_SECONDS)
+        return self.pool_with_threads()
+
+
+@pytest.fixture
+def fake_backend():
+    scrape_pool = FakeScrapePool()
+    limiter = RateLimiter(rate=0.01, burst=BURST)
+    cache = ProductCache(ttl=0)
+    with (
+        patch.object(ExecuteService, "pool", new=scrape_pool),
+        patch(
+            "src.execute.service.get_admission",
+            return_value=AdmissionController(capacity=WORKERS),
+        ),
+        patch(
+            "src.execute.service.get_site_admission",
+            return_value=AdmissionController(capacity=WORKERS),
+        ),
+        patch(
+            "src.execute.service.get_history_store",
+            return_value=HistoryStore(),
+        ),
+        patch("src.automation.app.get_rate_limiter", return_value=limiter),
+        patch("src.automation.app.PRODUCT_CACHE", cache),
+    ):
+        yield scrape_pool, cache
+
+
+async def get_scrape(client, client_id, priority="normal"):
+    return await client.get(
+        "/scrape?category=Apparel",
+        headers={"X-Client-Id": client_id, "X-Priority": priority},
+    )
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate=10, burst=SCRAPE_COST)
+
+    assert bucket.take(SCRAPE_COST)
+    assert not bucket.take(1)
+    bucket.updated -= 1
+
+    assert bucket.take(SCRAPE_COST)
+
+
+def test_rate_limiter_disabled_with_zero_rate():
+    limiter = RateLimiter(rate=0, burst=1)
+
+    assert all(limiter.allow("client", SCRAPE_COST) for _ in range(100))
+
+
+@pytest.mark.asyncio
+async def test_admission_reserves_workers_for_high_priority():
+    admission = AdmissionController(capacity=WORKERS, reserved=1)
+
+    assert await admission.acquire("normal")
+    assert not await admission.acquire("low")
+    assert await admission.acquire("high")
+    assert admission.available() == 0
+
+    waiter = asyncio.create_task(admission.acquire("high"))
+    await admission.release()
+    assert await waiter
+
+
+@pytest.mark.asyncio
+async def test_noisy_client_cannot_starve_others(fake_backend):
+    scrape_pool, cache = fake_backend
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+        noisy = [get_scrape(client, "noisy") for _ in range(NOISY_REQUESTS)]
+        responses = await asyncio.gather(
+            *noisy, get_scrape(client, "quiet", priority="high")
+        )
+
+    noisy_codes = [response.status_code for response in responses[:-1]]
+    assert noisy_codes.count(STATUS_CODE_OK) == BURST // SCRAPE_COST
+    rejected = [
+        response
+        for response in responses[:-1]
+        if response.status_code == STATUS_TOO_MANY_REQUESTS
+    ]
+    assert len(rejected) == NOISY_REQUESTS - BURST // SCRAPE_COST
+    assert all("Retry-After" in response.headers for response in rejected)
+    assert responses[-1].status_code == STATUS_CODE_OK
+    assert scrape_pool.calls == BURST // SCRAPE_COST + 1
+
+
+@pytest.mark.asyncio
+async def test_shedding_serves_stale_snapshot(fake_backend):
+    scrape_pool, cache = fake_backend
+    cache.put("Apparel", scrape_pool.pool_with_threads())
+    transport = httpx.ASGITransport(app=app)
+    with patch(
+        "src.execute.cache.get_settings", return_value=Settings(stale_ttl=60)
+    ):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            responses = await asyncio.gather(
+                *[get_scrape(client, "noisy") for _ in range(4)]
+            )
+
+    assert [response.status_code for response in responses] == [
+        STATUS_CODE_OK
+    ] * 4
+    assert sorted(response.headers["X-Cache"] for response in responses) == [
+        "miss",
+        "miss",
+        "stale",
+        "stale",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_slow_site_cannot_starve_other_sites(fake_backend):
+    # Arrange: two shared workers, each site may hold only one.
+    profiles = {
+        name: SiteProfile(name=name, max_concurrency=1)
+        for name in ("slow", "fast")
+    }
+    admissions = {name: AdmissionController(capacity=1) for name in profiles}
+    transport = httpx.ASGITransport(app=app)
+
+    async def get_site(client, site, client_id):
+        return await client.get(
+            f"/sites/{site}/scrape?category=Apparel",
+            headers={"X-Client-Id": client_id},
+        )
+
+    with (
+        patch("src.automation.app.get_site_profile", profiles.get),
+        patch("src.execute.service.get_site_admission", admissions.get),
+    ):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            # Act
+            slow = [
+                get_site(client, "slow", f"slow-{index}")
+                for index in range(SLOW_SITE_REQUESTS)
+            ]
+            responses = await asyncio.gather(
+                *slow, get_site(client, "fast", "fast")
+            )
+
+    # Assert
+    slow_codes = [response.status_code for response in responses[:-1]]
+    assert slow_codes.count(STATUS_CODE_OK) == 1
+    assert slow_codes.count(STATUS_TOO_MANY_REQUESTS) == SLOW_SITE_REQUESTS - 1
+    assert responses[-1].status_code == STATUS_CODE_OK
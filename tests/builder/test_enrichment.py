@@ -0,0 +1,201 @@
+# tests/builder/test_enrichment.py
+
+import threading
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+from src.builder.enrichment import (
+    DetailCache,
+    DetailEnricher,
+    HostLimits,
+    parse_detail,
+)
+from src.models.product import Product
+
+LINK = "https://shop.example.com/product/1"
+PAGE = b"""
+<html><head><meta name="description" content="Meta text"></head>
+<body>
+  <div class="product-description"><p>Soft  cotton</p> shirt</div>
+  <span id="product-sku">SKU: AB-123</span>
+  <img src="/img/1.png"><img src="https://cdn.example.com/2.png">
+</body></html>
+"""
+HTTP_OK = 200
+HTTP_NOT_MODIFIED = 304
+PER_HOST = 2
+PRODUCTS = 8
+FETCH_WAIT = 2
+LISTED = 2
+
+
+def make_product(link: str = LINK):
+    return Product(
+        title="Test Product",
+        price=9.99,
+        link=link,
+        stock_status="In Stock",
+        stock_quantity=10,
+        total=1,
+    )
+
+
+def make_client(status=HTTP_OK, data=PAGE, etag='"v1"'):
+    client = MagicMock()
+    client.request.return_value = Mock(
+        status=status, data=data, headers={"ETag": etag}
+    )
+    return client
+
+
+def test_parse_detail():
+    detail = parse_detail(PAGE.decode(), LINK)
+
+    assert detail.description == "Soft cotton shirt"
+    assert detail.sku == "AB-123"
+    assert detail.images == [
+        "https://shop.example.com/img/1.png",
+        "https://cdn.example.com/2.png",
+    ]
+
+
+def test_parse_detail_with_void_elements_in_description():
+    page = (
+        '<div class="description">Soft cotton<br>shirt</div>'
+        '<div class="sku">SKU: AB-1<br/></div>'
+    )
+
+    detail = parse_detail(page, LINK)
+
+    assert detail.description == "Soft cotton shirt"
+    assert detail.sku == "AB-1"
+
+
+def test_fresh_cache_skips_request():
+    client = make_client()
+    enricher = DetailEnricher(
+        client, DetailCache(ttl=60), HostLimits(PER_HOST)
+    )
+
+    first = enricher.detail(LINK)
+    second = enricher.detail(LINK)
+
+    assert first == second
+    client.request.assert_called_once()
+
+
+def test_expired_entry_revalidates_with_etag():
+    client = make_client()
+    enricher = DetailEnricher(client, DetailCache(ttl=0), HostLimits(PER_HOST))
+    first = enricher.detail(LINK)
+    client.request.return_value = Mock(
+        status=HTTP_NOT_MODIFIED, data=b"", headers={}
+    )
+
+    second = enricher.detail(LINK)
+
+    assert second == first
+    headers = client.request.call_args.kwargs["headers"]
+    assert headers == {"If-None-Match": '"v1"'}
+
+
+def test_unchanged_content_is_not_parsed_again():
+    client = make_client(etag=None)
+    enricher = DetailEnricher(client, DetailCache(ttl=0), HostLimits(PER_HOST))
+    enricher.detail(LINK)
+
+    with patch("src.builder.enrichment.parse_detail") as mock_parse:
+        enricher.detail(LINK)
+
+    mock_parse.assert_not_called()
+
+
+def test_browser_fallback_only_when_static_page_is_empty():
+    client = make_client(data=b"<html><body></body></html>")
+    browser_fetch = Mock(return_value=PAGE.decode())
+    enricher = DetailEnricher(
+        client,
+        DetailCache(ttl=60),
+        HostLimits(PER_HOST),
+        browser_fetch=browser_fetch,
+    )
+
+    detail = enricher.detail(LINK)
+
+    browser_fetch.assert_called_once_with(LINK)
+    assert detail.sku == "AB-123"
+
+
+def test_enrich_bounds_concurrency_per_host():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def request(*args, **kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return Mock(status=HTTP_OK, data=PAGE, headers={})
+
+    client = MagicMock()
+    client.request.side_effect = request
+    enricher = DetailEnricher(
+        client, DetailCache(ttl=60), HostLimits(PER_HOST), workers=PRODUCTS
+    )
+    products = [make_product(f"{LINK}?id={i}") for i in range(PRODUCTS)]
+
+    enriched = list(enricher.enrich(products + products))
+
+    assert len(enriched) == PRODUCTS
+    assert peak <= PER_HOST
+    assert all(product.detail.sku == "AB-123" for product in enriched)
+
+
+def test_enrich_fetches_details_while_products_are_listed():
+    fetched = threading.Event()
+    client = make_client()
+    client.request.side_effect = lambda *args, **kwargs: (
+        fetched.set() or Mock(status=HTTP_OK, data=PAGE, headers={})
+    )
+    enricher = DetailEnricher(
+        client, DetailCache(ttl=60), HostLimits(PER_HOST)
+    )
+    fetched_while_listing = []
+
+    def listing():
+        yield make_product()
+        fetched_while_listing.append(fetched.wait(FETCH_WAIT))
+        yield make_product(f"{LINK}?id=2")
+
+    enriched = list(enricher.enrich(listing()))
+
+    assert fetched_while_listing == [True]
+    assert len(enriched) == LISTED
+
+
+def test_enrich_keeps_product_when_detail_fails():
+    client = make_client(status=500)
+    enricher = DetailEnricher(
+        client, DetailCache(ttl=60), HostLimits(PER_HOST)
+    )
+
+    [enriched] = list(enricher.enrich([make_product()]))
+
+    assert enriched.link == LINK
+    assert enriched.detail.description == ""
+
+
+def test_enrichers_share_the_host_limit():
+    # Arrange
+    host_limits = HostLimits(PER_HOST)
+    first = DetailEnricher(make_client(), DetailCache(ttl=60), host_limits)
+    second = DetailEnricher(make_client(), DetailCache(ttl=60), host_limits)
+
+    # Act
+    limits = [first.host_limit(LINK), second.host_limit(f"{LINK}?id=2")]
+
+    # Assert
+    assert limits[0] is limits[1]
@@ -0,0 +1,33 @@
+# tests/builder/test_parsing.py
+
+import pytest
+
+from src.builder.parsing import parse_price, parse_stock, product_from_cells
+
+PRICE = 1299.5
+QUANTITY = 12
+
+
+def test_parse_price_strips_currency():
+    assert parse_price(" $1,299.50 ") == PRICE
+
+
+def test_parse_stock():
+    assert parse_stock("In Stock (12)") == ("In Stock", QUANTITY)
+    assert parse_stock("Out of Stock") == ("Out of Stock", 0)
+
+
+def test_parse_stock_without_quantity_fails():
+    with pytest.raises(AttributeError):
+        parse_stock("In Stock")
+
+
+def test_product_from_cells():
+    cells = ["1", " Shirt ", "Apparel", "$1,299.50", "In Stock (12)"]
+
+    product = product_from_cells(cells, None, total=3)
+
+    assert product.title == "Shirt"
+    assert product.price == PRICE
+    assert product.link == ""
+    assert product.stock_quantity == QUANTITY
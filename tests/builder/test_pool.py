@@ -9,6 +9,7 @@ from src.models.product import Product
 
 SIZE = 4
 MOCK_COUNT_MAX = 4
+STREAM_IN_FLIGHT = 3
 
 
 @pytest.fixture
@@ -25,12 +26,12 @@ def fake_product():
 
 
 @patch("src.builder.pool.PageObject")
-def test_run_scraper(mock_pageobject_class, fake_product):
+def test_extract(mock_pageobject_class, fake_product):
     mock_instance = MagicMock()
-    mock_instance.scrape_products.return_value = [fake_product]
+    mock_instance.extract_products.return_value = [fake_product]
     mock_pageobject_class.return_value = mock_instance
 
-    result = ScrapePool(size=SIZE, category="Fake Category").run_scraper()
+    result = ScrapePool(size=SIZE, category="Fake Category").extract()
 
     assert isinstance(result, list)
     assert len(result) == 1
@@ -55,6 +56,50 @@ def test_main_aggregates_products():
         mock_page_object_instance = mock_page_object.return_value
         mock_page_object_instance.scrape.return_value = mock_products
         pool = ScrapePool(size=1, category=category)
-        results = pool.run_scraper()
+        results = pool.extract()
         assert results != mock_products
         mock_page_object.assert_called_once_with(category=category)
+
+
+def test_pool_runs_one_scrape_per_session(fake_product):
+    page_object = MagicMock()
+    page_object.extract_products.return_value = [fake_product]
+    pool = ScrapePool(size=SIZE, category="Apparel", page_object=page_object)
+
+    products = pool.pool_with_threads()
+
+    assert products == [fake_product]
+    page_object.extract_products.assert_called_once()
+
+
+def test_stream_is_bounded_and_stops_when_abandoned(fake_product):
+    produced = []
+
+    def stream_products(sink, chunk_size):
+        for _ in range(100):
+            produced.append(chunk_size)
+            sink([fake_product] * chunk_size)
+
+    page_object = MagicMock()
+    page_object.stream_products.side_effect = stream_products
+    pool = ScrapePool(size=1, category="Apparel", page_object=page_object)
+
+    chunks = pool.stream(maxsize=1, chunk_size=2)
+    first = next(chunks)
+    chunks.close()
+
+    assert first == [fake_product] * 2
+    # One chunk consumed, one queued and one blocked on the full queue
+    assert len(produced) <= STREAM_IN_FLIGHT
+
+
+def test_stream_yields_every_chunk(fake_product):
+    page_object = MagicMock()
+    page_object.stream_products.side_effect = lambda sink, chunk_size: [
+        sink([fake_product]) for _ in range(MOCK_COUNT_MAX)
+    ]
+    pool = ScrapePool(size=1, category="Apparel", page_object=page_object)
+
+    chunks = list(pool.stream(maxsize=1))
+
+    assert len(chunks) == MOCK_COUNT_MAX
@@ -0,0 +1,100 @@
+# tests/builder/test_profiles.py
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from src.builder.profiles import (
+    SiteExtractor,
+    SiteRegistry,
+    default_extractor,
+    load_profiles,
+)
+from src.models.site import DEFAULT_SITE, SiteProfile
+
+SITE_URL = "https://shop.example.com/"
+PRICE = 12.5
+QUANTITY = 7
+DEFAULT_MIN_COLUMNS = 6
+CONCURRENCY = 2
+
+
+def other_site() -> SiteProfile:
+    return SiteProfile(
+        name="other",
+        url=SITE_URL,
+        row_selector="table.items tbody tr",
+        link_selector="a.more",
+        categories={"Everything": 0, "Books": 1},
+        default_category="Everything",
+        columns={"title": 0, "price": 1, "stock": 2, "link": 3},
+        parse={
+            "in_stock_text": "Available",
+            "stock_quantity": r"(\d+) left",
+            "min_columns": 4,
+        },
+        max_concurrency=CONCURRENCY,
+    )
+
+
+def test_default_extractor_matches_original_layout():
+    extractor = default_extractor()
+
+    assert extractor.name == DEFAULT_SITE
+    assert '"#product-tbody tr"' in extractor.row_range_script
+    assert '".view-details-btn"' in extractor.row_range_script
+    assert extractor.min_columns == DEFAULT_MIN_COLUMNS
+    product = extractor.product(
+        ["1", "Shirt", "Apparel", "$12.50", "In Stock (7)", ""],
+        "https://example.com/1",
+        total=1,
+    )
+    assert product.price == PRICE
+    assert product.stock_quantity == QUANTITY
+
+
+def test_profile_columns_and_parse_rules_are_applied():
+    extractor = SiteExtractor(other_site(), default_url=None)
+
+    product = extractor.product(
+        ["Novel", "12.50 EUR", "Available: 7 left", ""],
+        "https://shop.example.com/novel",
+        total=1,
+    )
+
+    assert extractor.url == SITE_URL
+    assert '"table.items tbody tr"' in extractor.row_range_script
+    assert product.title == "Novel"
+    assert product.price == PRICE
+    assert product.stock_status == "In Stock"
+    assert product.stock_quantity == QUANTITY
+
+
+def test_profile_rejects_columns_beyond_min_columns():
+    with pytest.raises(ValidationError, match="exceed min_columns"):
+        SiteProfile(name="broken", parse={"min_columns": 3})
+
+
+def test_profile_rejects_unknown_default_category():
+    with pytest.raises(ValidationError, match="Default category"):
+        SiteProfile(name="broken", categories={"Books": 0})
+
+
+def test_registry_compiles_each_profile_once():
+    registry = SiteRegistry([other_site()], default_url=None)
+
+    first = registry.extractor("other")
+
+    assert registry.extractor("other") is first
+    assert registry.profile("missing") is None
+
+
+def test_load_profiles_from_json_file(tmp_path):
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps([other_site().model_dump()]))
+
+    profiles = load_profiles(str(path))
+
+    assert [profile.name for profile in profiles] == ["other"]
+    assert profiles[0].max_concurrency == CONCURRENCY
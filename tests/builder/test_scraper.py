@@ -1,11 +1,15 @@
 # tests/builder/test_scraper.py
 import os
+import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from dotenv import load_dotenv
+from selenium.webdriver.common.keys import Keys
 
-from src.builder.scraper import PageObject
+from src.builder.profiles import SiteExtractor
+from src.builder.scraper import PAGE_MAX_AGE, PageObject, PageState
+from src.models.site import SiteProfile
 
 load_dotenv(
     dotenv_path=os.path.join(
@@ -16,6 +20,11 @@ load_dotenv(
 URL_BASE = os.environ.get("URL")
 TOTAL_PRODUCTS = 10
 KEY_DOWN_COUNT = 1
+EXPECTED_AFTER_SWITCH = 4
+PAGE_URL = "https://example.com/"
+STREAM_ROWS = 5
+STREAM_CHUNK = 4
+STREAM_QUANTITY = 3
 
 
 @pytest.fixture
@@ -110,49 +119,170 @@ def test_total_products(page_object, mock_webdriver):
     assert result == TOTAL_PRODUCTS
 
 
-def test_scrape_products(page_object, mock_webdriver):
+def test_extract_products_retries_failed_rows(page_object, mock_webdriver):
     driver, wait, logger = mock_webdriver
+    page_object.prepare_page = Mock(return_value=True)
+    page_object.expected_count = 1
+    bad = ["1", "Retried Product", "Apparel", "$", "Out of Stock", ""]
+    good = ["1", "Retried Product", "Apparel", "$5.00", "Out of Stock", ""]
+    link = "https://example.com/retried"
+    # Only the failed row is re-read, the DOM re-rendered it meanwhile.
+    driver.execute_script.side_effect = lambda script, *args: (
+        [1, [[good if args == (0, 1) else bad, link]]] if args else None
+    )
+
+    products = page_object.extract_products()
+
+    assert [product.title for product in products] == ["Retried Product"]
+    assert products[0].total == 1
+    assert products[0].stock_quantity == 0
+    ranges = [call.args[1:] for call in driver.execute_script.call_args_list]
+    assert (0, 1) in ranges
+
+
+def test_select_category_unknown_category(page_object, mock_webdriver):
+    driver, wait, logger = mock_webdriver
+    page_object.category = "Garden"
+    driver.execute_script.return_value = "Apparel"
+
+    assert page_object.select_category(products=[]) is False
+    wait.until.assert_not_called()
+
+
+def test_select_category_with_retry_reloads_as_last_resort(page_object):
+    page_object.select_category = Mock(side_effect=[False, False, True])
+    page_object.load_page = Mock()
+
+    assert page_object.select_category_with_retry(products=[]) is True
+    page_object.load_page.assert_called_once()
+
+
+def test_extract_products_gives_up_without_unfiltered_table(page_object):
+    page_object.load_page = Mock()
+    page_object.select_category = Mock(return_value=False)
+
+    assert page_object.extract_products() == []
+
+
+def test_extract_products_reuses_loaded_page(page_object, mock_webdriver):
+    driver, wait, logger = mock_webdriver
+    driver.current_url = PAGE_URL
+    driver.execute_script.side_effect = [
+        "complete|3|home|3|120",  # fingerprint check
+        "Home Goods",  # selected category, nothing to switch
+        [0, []],  # rows
+        "complete|3|home|3|120",  # fingerprint after scrape
+    ]
+    page_object.page_state = PageState(
+        url=PAGE_URL,
+        category="Home Goods",
+        fingerprint="complete|3|home|3|120",
+        loaded_at=time.monotonic(),
+    )
+    page_object.loaded_at = page_object.page_state.loaded_at
+    wait.until.side_effect = [Mock(text="3")]
+
+    with patch("src.builder.scraper.get_snapshot_store", return_value=None):
+        page_object.extract_products()
+
+    driver.get.assert_not_called()
+    assert page_object.page_state.category == "Home Goods"
+
+
+def test_extract_products_reloads_stale_page(page_object, mock_webdriver):
+    driver, wait, logger = mock_webdriver
+    page_object.page_state = PageState(
+        url=URL_BASE,
+        category="Home Goods",
+        fingerprint="complete|3|home|3|120",
+        loaded_at=time.monotonic() - PAGE_MAX_AGE - 1,
+    )
+    page_object.select_category_with_retry = Mock(return_value=False)
+
+    page_object.extract_products()
+
+    driver.get.assert_called_once_with(URL_BASE)
+    assert page_object.page_state is None
+
+
+def test_select_category_switches_in_place(page_object, mock_webdriver):
+    driver, wait, logger = mock_webdriver
+    page_object.category = "Apparel"
+    driver.execute_script.return_value = "Electronics"
+    wait.until.side_effect = [Mock(), Mock(), True, Mock(text="4")]
+
+    with patch("src.builder.scraper.ActionChains") as mock_action_chains:
+        mock_action = mock_action_chains.return_value
+        mock_action.key_down.return_value = mock_action
+        mock_action.pause.return_value = mock_action
+
+        assert page_object.select_category(products=[]) is True
+
+    keys = [call.args[0] for call in mock_action.key_down.call_args_list]
+    assert keys == [Keys.UP, Keys.UP, Keys.ENTER]
+    assert page_object.expected_count == EXPECTED_AFTER_SWITCH
+
+
+def test_stream_products_reads_rows_by_range(page_object, mock_webdriver):
+    driver, wait, logger = mock_webdriver
+    page_object.prepare_page = Mock(return_value=True)
+    page_object.expected_count = STREAM_ROWS
+    row = [["1", "Product", "Apparel", "$2.50", "In Stock (3)", ""], ""]
+    driver.execute_script.side_effect = lambda script, *args: (
+        [STREAM_ROWS, [row] * (min(args[1], STREAM_ROWS) - args[0])]
+        if args
+        else None
+    )
+    chunks = []
+
+    page_object.stream_products(chunks.append, chunk_size=STREAM_CHUNK)
+
+    assert [len(chunk) for chunk in chunks] == [STREAM_CHUNK, 1]
+    assert chunks[0][0].stock_quantity == STREAM_QUANTITY
+    ranges = [call.args[1:] for call in driver.execute_script.call_args_list]
+    assert (0, STREAM_CHUNK) in ranges
+    assert (STREAM_CHUNK, 2 * STREAM_CHUNK) in ranges
+
+
+def test_stream_products_skips_snapshot(page_object, mock_webdriver):
+    # Arrange
+    driver, wait, logger = mock_webdriver
+    page_object.prepare_page = Mock(return_value=True)
+    page_object.capture_snapshot = Mock()
+    driver.execute_script.return_value = [0, []]
+
+    # Act
+    page_object.stream_products(Mock())
+    page_object.extract_products()
+
+    # Assert
+    page_object.capture_snapshot.assert_called_once_with()
+
+
+def test_stream_products_uses_site_profile(page_object, mock_webdriver):
+    # Arrange
+    driver, wait, logger = mock_webdriver
+    profile = SiteProfile(
+        name="other",
+        row_selector="table.items tr",
+        categories={"Everything": 0},
+        default_category="Everything",
+        columns={"title": 0, "price": 1, "stock": 2, "link": 3},
+        parse={"min_columns": 4},
+    )
+    page_object.use_site(SiteExtractor(profile, default_url=PAGE_URL))
+    page_object.wait = wait
+    page_object.prepare_page = Mock(return_value=True)
+    row = [["Product", "$2.50", "In Stock (3)", ""], ""]
+    driver.execute_script.side_effect = lambda script, *args: (
+        [1, [row]] if args else None
+    )
+
+    # Act
+    products = page_object.extract_products()
 
-    with patch("src.builder.scraper.URL_BASE", URL_BASE):
-        # Mock para product-count, dropdown, e product rows
-        mock_product_count = Mock(text="2")
-        mock_dropdown = Mock()
-        mock_row = Mock()
-        mock_cols = [
-            Mock(text="ID"),
-            Mock(text="Product Title"),
-            Mock(text="Category"),
-            Mock(text="$19.99"),
-            Mock(text="In Stock (5)"),
-            Mock(spec=["find_element"]),
-        ]
-        mock_cols[5].find_element.return_value = Mock(
-            get_attribute=Mock(return_value=f"{URL_BASE}/product")
-        )
-        mock_row.find_elements.return_value = mock_cols
-
-        # Mock para find_elements no lambda de select_category
-        driver.find_elements.return_value = [
-            Mock()
-        ]  # Simulando uma linha na tabela
-
-        # Define side_effect para todas as chamadas de wait.until
-        wait.until.side_effect = [
-            mock_product_count,
-            mock_dropdown,
-            mock_dropdown,
-            [mock_row],
-            mock_product_count,
-            [mock_row],
-            mock_row,
-        ]
-
-        # Mock para ActionChains em select_category
-        with patch("src.builder.scraper.ActionChains") as mock_action_chains:
-            mock_action = Mock()
-            mock_action_chains.return_value = mock_action
-            mock_action.key_down.return_value = mock_action
-            mock_action.pause.return_value = mock_action
-            mock_action.perform.return_value = None
-
-            page_object.scrape_products()
+    # Assert
+    assert [product.title for product in products] == ["Product"]
+    assert products[0].stock_quantity == STREAM_QUANTITY
+    script = driver.execute_script.call_args_list[0].args[0]
+    assert '"table.items tr"' in script
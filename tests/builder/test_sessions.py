@@ -0,0 +1,99 @@
+# tests/builder/test_sessions.py
+
+from unittest.mock import MagicMock, patch
+
+from src.builder.sessions import SessionPool
+
+
+@patch("src.builder.sessions.PageObject")
+def test_acquire_opens_session_when_idle_is_empty(mock_page_object):
+    pool = SessionPool(max_idle=1)
+
+    page_object = pool.acquire("Apparel")
+
+    assert page_object is mock_page_object.return_value
+    mock_page_object.assert_called_once_with(category="Apparel")
+
+
+@patch("src.builder.sessions.PageObject")
+def test_release_keeps_session_for_next_category(mock_page_object):
+    pool = SessionPool(max_idle=1)
+    session = MagicMock(category="Apparel")
+    session.is_alive.return_value = True
+
+    pool.release(session)
+    reused = pool.acquire("Cosmetics")
+
+    assert reused is session
+    assert reused.category == "Cosmetics"
+    mock_page_object.assert_not_called()
+    session.close.assert_not_called()
+
+
+@patch("src.builder.sessions.PageObject")
+def test_acquire_discards_dead_sessions(mock_page_object):
+    pool = SessionPool(max_idle=1)
+    dead = MagicMock()
+    dead.is_alive.side_effect = [True, False]
+    pool.release(dead)
+
+    page_object = pool.acquire("Apparel")
+
+    dead.close.assert_called_once()
+    assert page_object is mock_page_object.return_value
+
+
+def test_release_beyond_max_idle_closes_session():
+    pool = SessionPool(max_idle=0)
+    session = MagicMock()
+
+    pool.release(session)
+
+    session.close.assert_called_once()
+    assert pool.size() == 0
+
+
+def test_release_recycles_degraded_session():
+    watchdog = MagicMock()
+    watchdog.check.return_value = "memory"
+    pool = SessionPool(max_idle=1, watchdog=watchdog)
+    session = MagicMock()
+
+    pool.release(session)
+
+    watchdog.recycle.assert_called_once_with(session, "memory")
+    assert pool.size() == 0
+
+
+def test_sweep_recycles_only_degraded_idle_sessions():
+    # Arrange
+    watchdog = MagicMock()
+    healthy, degraded = MagicMock(), MagicMock()
+    pool = SessionPool(max_idle=2, watchdog=watchdog)
+    watchdog.check.return_value = None
+    pool.release(healthy)
+    pool.release(degraded)
+    watchdog.check.side_effect = lambda page_object: (
+        "age" if page_object is degraded else None
+    )
+
+    # Act
+    recycled = pool.sweep()
+
+    # Assert
+    assert recycled == 1
+    watchdog.recycle.assert_called_once_with(degraded, "age")
+    assert pool.size() == 1
+
+
+def test_acquire_points_reused_session_at_requested_site():
+    pool = SessionPool(max_idle=1)
+    session = MagicMock()
+    session.is_alive.return_value = True
+    site = MagicMock()
+    pool.release(session)
+
+    reused = pool.acquire("Books", site=site)
+
+    assert reused is session
+    session.use_site.assert_called_once_with(site)
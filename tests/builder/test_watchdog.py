@@ -0,0 +1,196 @@
+# tests/builder/test_watchdog.py
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.builder.watchdog import (
+    BASELINE_SAMPLES,
+    MEBIBYTE,
+    SessionWatchdog,
+    cleanup_orphaned_sessions,
+    grid_root,
+    hub_ready,
+    quit_with_timeout,
+)
+from src.monitoring.metrics import METRICS
+
+HUB = "http://hub:4444/wd/hub"
+TAG = "testing-selenium-products"
+MAX_MEMORY_MB = 100
+QUIT_TIMEOUT = 0.05
+STATUS_OK = 200
+
+
+def session(created_at=None):
+    page_object = MagicMock()
+    page_object.created_at = created_at or time.monotonic()
+    page_object.is_alive.return_value = True
+    return page_object
+
+
+def test_healthy_session_is_kept():
+    watchdog = SessionWatchdog(max_age=60, max_memory_mb=MAX_MEMORY_MB)
+    page_object = session()
+    page_object.driver.execute_cdp_cmd.return_value = {
+        "metrics": [{"name": "JSHeapUsedSize", "value": 10 * MEBIBYTE}]
+    }
+
+    assert watchdog.check(page_object) is None
+
+
+def test_dead_session_is_reported():
+    watchdog = SessionWatchdog()
+    page_object = session()
+    page_object.is_alive.return_value = False
+
+    assert watchdog.check(page_object) == "dead"
+
+
+def test_old_session_is_recycled():
+    watchdog = SessionWatchdog(max_age=60)
+    page_object = session(created_at=time.monotonic() - 120)
+
+    assert watchdog.check(page_object) == "age"
+
+
+def test_memory_falls_back_to_performance_memory():
+    # Arrange: Remote drivers have no CDP command.
+    watchdog = SessionWatchdog(max_memory_mb=MAX_MEMORY_MB)
+    page_object = session()
+    page_object.driver.execute_cdp_cmd.side_effect = AttributeError
+    page_object.driver.execute_script.return_value = 200 * MEBIBYTE
+
+    # Act
+    reason = watchdog.check(page_object)
+
+    # Assert
+    assert reason == "memory"
+
+
+def test_latency_trend_above_baseline_is_recycled():
+    # Arrange
+    watchdog = SessionWatchdog(latency_factor=3)
+    page_object = session()
+    health = watchdog.health(page_object)
+    for _ in range(BASELINE_SAMPLES):
+        health.observe(0.02)
+
+    # Act
+    for _ in range(10):
+        health.observe(0.5)
+
+    # Assert
+    assert watchdog.degraded(page_object) == "latency"
+
+
+def test_fast_probes_never_count_as_degraded():
+    watchdog = SessionWatchdog(latency_factor=3)
+    page_object = session()
+    health = watchdog.health(page_object)
+    for _ in range(BASELINE_SAMPLES):
+        health.observe(0.001)
+    for _ in range(10):
+        health.observe(0.01)
+
+    assert watchdog.degraded(page_object) is None
+
+
+def test_recycle_closes_and_counts():
+    watchdog = SessionWatchdog()
+    page_object = session()
+    before = METRICS.value("scraper_session_recycles_total", reason="age")
+
+    watchdog.recycle(page_object, "age")
+
+    page_object.close.assert_called_once()
+    after = METRICS.value("scraper_session_recycles_total", reason="age")
+    assert after == before + 1
+
+
+def test_quit_with_timeout_gives_up_on_hung_quit():
+    # Arrange
+    release = threading.Event()
+    driver = MagicMock()
+    driver.quit.side_effect = release.wait
+
+    # Act
+    started = time.monotonic()
+    finished = quit_with_timeout(driver, QUIT_TIMEOUT)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    # Assert
+    assert finished is False
+    assert elapsed < 1
+
+
+def test_quit_with_timeout_raises_quit_errors():
+    driver = MagicMock()
+    driver.quit.side_effect = RuntimeError("gone")
+
+    with pytest.raises(RuntimeError, match="gone"):
+        quit_with_timeout(driver, 1)
+
+
+def test_grid_root_strips_legacy_prefix():
+    assert grid_root(HUB) == "http://hub:4444"
+    assert grid_root("http://hub:4444/") == "http://hub:4444"
+
+
+def test_cleanup_deletes_only_tagged_sessions():
+    # Arrange
+    status = MagicMock()
+    status.json.return_value = {
+        "value": {
+            "ready": True,
+            "nodes": [
+                {
+                    "slots": [
+                        {"session": None},
+                        {
+                            "session": {
+                                "sessionId": "ours",
+                                "capabilities": {"se:name": TAG},
+                            }
+                        },
+                        {
+                            "session": {
+                                "sessionId": "theirs",
+                                "capabilities": {"se:name": "other"},
+                            }
+                        },
+                    ]
+                }
+            ],
+        }
+    }
+    http_client = MagicMock()
+    http_client.request.side_effect = [status, MagicMock(status=STATUS_OK)]
+
+    # Act
+    removed = cleanup_orphaned_sessions(http_client, HUB, TAG)
+
+    # Assert
+    assert removed == ["ours"]
+    method, url = http_client.request.call_args.args
+    assert method == "DELETE"
+    assert url == "http://hub:4444/session/ours"
+
+
+def test_hub_ready_reads_grid_status():
+    status = MagicMock()
+    status.json.return_value = {"value": {"ready": True, "nodes": []}}
+    http_client = MagicMock()
+    http_client.request.return_value = status
+
+    assert hub_ready(http_client, HUB, timeout=1)
+
+
+def test_unreachable_hub_is_not_ready():
+    http_client = MagicMock()
+    http_client.request.side_effect = OSError("connection refused")
+
+    assert not hub_ready(http_client, HUB, timeout=1)
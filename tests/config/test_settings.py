@@ -0,0 +1,70 @@
+# tests/config/test_settings.py
+
+import pytest
+
+from src.config.settings import Settings
+
+WORK_THREAD = 4
+CACHE_TTL = 2.5
+
+
+def test_settings_from_env():
+    settings = Settings.from_env(
+        {
+            "URL": "https://example.com",
+            "HUB_SELENIUM": "http://hub:4444/wd/hub",
+            "WORK_THREAD": "4",
+            "CACHE_TTL": "2.5",
+        }
+    )
+
+    assert settings.url == "https://example.com"
+    assert settings.hub_selenium == "http://hub:4444/wd/hub"
+    assert settings.work_thread == WORK_THREAD
+    assert settings.cache_ttl == CACHE_TTL
+
+
+def test_settings_defaults_when_missing():
+    settings = Settings.from_env({})
+
+    assert settings.url is None
+    assert settings.work_thread == 1
+    assert settings.cache_ttl == 0
+
+
+@pytest.mark.parametrize("value", ["invalid", "0"])
+def test_settings_invalid_work_thread(value):
+    with pytest.raises(ValueError, match="Invalid WORK_THREAD"):
+        Settings.from_env({"WORK_THREAD": value})
+
+
+@pytest.mark.parametrize(("value", "expected"), [("true", True), ("0", False)])
+def test_settings_cleanup_orphans_flag(value, expected):
+    settings = Settings.from_env({"CLEANUP_ORPHANS": value})
+
+    assert settings.cleanup_orphans is expected
+
+
+def test_settings_invalid_flag():
+    with pytest.raises(ValueError, match="Invalid CLEANUP_ORPHANS"):
+        Settings.from_env({"CLEANUP_ORPHANS": "maybe"})
+
+
+def test_settings_warm_categories():
+    settings = Settings.from_env(
+        {"WARM_CATEGORIES": "Apparel, Home Goods", "CACHE_TTL": "60"}
+    )
+
+    assert settings.warm_categories == ["Apparel", "Home Goods"]
+
+
+def test_settings_invalid_warm_category():
+    with pytest.raises(ValueError, match="Invalid WARM_CATEGORIES"):
+        Settings.from_env(
+            {"WARM_CATEGORIES": "Apparel,Garden", "CACHE_TTL": "60"}
+        )
+
+
+def test_settings_warm_categories_require_a_cache_ttl():
+    with pytest.raises(ValueError, match="requires CACHE_TTL"):
+        Settings.from_env({"WARM_CATEGORIES": "Apparel"})
@@ -0,0 +1,78 @@
+# tests/execute/test_cache.py
+
+import json
+from unittest.mock import patch
+
+from src.execute.cache import ProductCache, completeness_headers
+from src.models.product import Product
+
+TTL = 60
+
+
+def make_products():
+    return [
+        Product(
+            title="Test Product",
+            price=9.99,
+            link="https://example.com/product",
+            stock_status="In Stock",
+            stock_quantity=10,
+            total=1,
+        )
+    ]
+
+
+def test_put_serializes_payload_once():
+    cache = ProductCache(ttl=TTL)
+    products = make_products()
+
+    entry = cache.put("Apparel", products)
+
+    assert json.loads(entry.payload) == [products[0].model_dump()]
+    assert cache.get("Apparel") is entry
+
+
+def test_get_ignores_expired_entries_but_keeps_latest():
+    cache = ProductCache(ttl=TTL)
+    entry = cache.put("Apparel", make_products())
+
+    with patch.object(entry, "age", return_value=TTL + 1):
+        assert cache.get("Apparel") is None
+        assert cache.latest("Apparel") is entry
+
+
+def test_zero_ttl_disables_hits():
+    cache = ProductCache(ttl=0)
+    cache.put("Apparel", make_products())
+
+    assert cache.get("Apparel") is None
+    assert cache.latest("Apparel") is not None
+
+
+def test_put_computes_completeness_headers_once():
+    cache = ProductCache(ttl=TTL)
+    cache.put("Apparel", make_products())
+
+    with patch("src.execute.cache.completeness_headers") as mock_headers:
+        entry = cache.get("Apparel")
+
+    mock_headers.assert_not_called()
+    assert entry.headers["X-Products-Complete"] == "true"
+
+
+def test_completeness_counts_same_title_rows_without_link():
+    rows = [
+        Product(
+            title="Gift Card",
+            price=10.0,
+            link="",
+            stock_status="In Stock",
+            stock_quantity=1,
+            total=2,
+        )
+    ] * 2
+
+    headers = completeness_headers(rows)
+
+    assert headers["X-Products-Parsed"] == "2"
+    assert headers["X-Products-Complete"] == "true"
@@ -1,14 +1,16 @@
 # src/execute/test_service.py
-import asyncio
 import logging
 import os
 from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.execute.service import ExecuteService
+from src.config.settings import Settings
+from src.execute.service import AdmissionController, ExecuteService
 from src.models.product import Product
+from src.models.site import DEFAULT_SITE
 
 WORKS_THREAD = int(os.environ.get("WORK_THREAD"))
 
@@ -75,10 +77,10 @@ async def test_execute_service_run_no_worker_available(caplog):
     with patch.dict(os.environ, {"WORK_THREAD": "4"}):
         service = ExecuteService(category=category)
 
-        # Mock semaphore acquire to raise TimeoutError
+        # Mock admission acquire to time out, it reports False
         with patch(
             "src.execute.service.SCRAPER_SEMAPHORE.acquire",
-            AsyncMock(side_effect=asyncio.TimeoutError),
+            AsyncMock(return_value=False),
         ):
             # Capture logging
             caplog.set_level(logging.INFO)
@@ -152,3 +154,118 @@ async def test_execute_service_run_executor_setup():
                         assert result == mock_products
                         mock_loop.return_value.run_in_executor.assert_called_once()
                         mock_executor.assert_called_once_with(2)
+
+
+@pytest.mark.asyncio
+async def test_history_failure_does_not_fail_the_scrape():
+    # Arrange
+    products = [
+        Product(
+            title="Product",
+            price=1.0,
+            link="https://example.com/product",
+            stock_status="In Stock",
+            stock_quantity=1,
+            total=1,
+        )
+    ]
+    service = ExecuteService(category="Apparel", settings=Settings())
+    service._pool = MagicMock()
+    service._pool.pool_with_threads.return_value = products
+    store = MagicMock()
+    store.record.side_effect = OSError("disk full")
+
+    # Act
+    with (
+        patch(
+            "src.execute.service.get_admission",
+            return_value=AdmissionController(capacity=1),
+        ),
+        patch("src.execute.service.get_history_store", return_value=store),
+    ):
+        result = await service.run()
+
+    # Assert
+    assert result == products
+    store.record.assert_called_once_with("Apparel", products)
+
+
+def test_enrich_stream_records_the_listing_once_read():
+    # Arrange
+    product = Product(
+        title="Product",
+        price=1.0,
+        link="https://example.com/product",
+        stock_status="In Stock",
+        stock_quantity=1,
+        total=1,
+    )
+    service = ExecuteService(category="Apparel", settings=Settings())
+    service.stream = MagicMock(return_value=iter([[product], [product]]))
+    service.enrich = MagicMock(side_effect=list)
+    store = MagicMock()
+    on_listed = MagicMock()
+
+    # Act
+    with patch("src.execute.service.get_history_store", return_value=store):
+        enriched = service.enrich_stream(on_listed)
+
+    # Assert
+    assert enriched == [product, product]
+    store.record.assert_called_once_with("Apparel", [product, product])
+    on_listed.assert_called_once_with([product, product])
+
+
+@pytest.mark.asyncio
+async def test_default_site_admission_bounds_scrapes_without_site():
+    # Arrange
+    service = ExecuteService(category="Apparel", settings=Settings())
+    default_admission = AdmissionController(capacity=1)
+    admission = AdmissionController(capacity=2)
+    await default_admission.acquire()
+
+    # Act
+    with (
+        patch("src.execute.service.get_admission", return_value=admission),
+        patch(
+            "src.execute.service.get_site_admission",
+            {DEFAULT_SITE: default_admission}.get,
+        ),
+        pytest.raises(RuntimeError, match="no_worker_available"),
+    ):
+        await service.acquire_worker(priority="low")
+
+    # Assert
+    assert admission.in_use == 0
+
+
+def test_enrich_opens_no_browser_session_for_static_pages():
+    # Arrange
+    product = Product(
+        title="Product",
+        price=1.0,
+        link="https://example.com/product",
+        stock_status="In Stock",
+        stock_quantity=1,
+        total=1,
+    )
+    http = MagicMock()
+    http.request.return_value = MagicMock(
+        status=HTTPStatus.OK,
+        data=b'<div class="sku">SKU: AB-1</div>',
+        headers={},
+    )
+    service = ExecuteService(category="Apparel", settings=Settings())
+
+    # Act
+    with (
+        patch("src.builder.enrichment.get_detail_http", return_value=http),
+        patch("src.builder.enrichment.get_detail_cache") as get_cache,
+    ):
+        get_cache.return_value.fresh.return_value = None
+        get_cache.return_value.get.return_value = None
+        [enriched] = list(service.enrich([product]))
+
+    # Assert
+    assert enriched.detail.sku == "AB-1"
+    assert service._pool is None
@@ -0,0 +1,158 @@
+# tests/execute/test_warmup.py
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.builder.sessions import SessionPool
+from src.execute.cache import ProductCache
+from src.execute.warmup import Warmup
+from src.models.product import Product
+
+WARM_SESSIONS = 2
+POOL_SIZE = 3
+# One failure, one empty scrape, then a success.
+PRIME_ATTEMPTS = 3
+
+
+def product() -> Product:
+    return Product(
+        title="Warm Product",
+        price=1.0,
+        link="https://example.com/warm",
+        stock_status="In Stock",
+        stock_quantity=1,
+        total=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_warmup_opens_sessions_into_the_pool():
+    # Arrange
+    pool = SessionPool(max_idle=POOL_SIZE)
+    warmup = Warmup(sessions=WARM_SESSIONS, categories=[], max_idle=POOL_SIZE)
+    with (
+        patch("src.builder.sessions.get_session_pool", return_value=pool),
+        patch("src.builder.sessions.PageObject") as mock_page_object,
+    ):
+        mock_page_object.side_effect = lambda category: MagicMock()
+
+        # Act
+        await warmup.run()
+        ready = warmup.sessions_ready()
+
+    # Assert
+    assert warmup.state.sessions == WARM_SESSIONS
+    assert pool.size() == WARM_SESSIONS
+    assert ready
+    assert all(session.warm_up.called for session in pool.idle)
+
+
+def test_warmup_never_opens_more_than_the_pool_keeps():
+    warmup = Warmup(sessions=POOL_SIZE + 1, categories=[], max_idle=POOL_SIZE)
+
+    assert warmup.sessions == POOL_SIZE
+
+
+@pytest.mark.asyncio
+async def test_warmup_primes_the_cache():
+    # Arrange
+    cache = ProductCache(ttl=0)
+    warmup = Warmup(sessions=0, categories=["Apparel"], max_idle=0)
+    with (
+        patch("src.execute.warmup.ExecuteService") as mock_service,
+        patch("src.execute.warmup.PRODUCT_CACHE", cache),
+    ):
+        mock_service.return_value.run = AsyncMock(return_value=[product()])
+
+        # Act
+        await warmup.run()
+        primed = warmup.cache_primed()
+
+    # Assert
+    assert primed
+    mock_service.return_value.run.assert_awaited_once_with(priority="high")
+    mock_service.return_value.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_prime_is_retried_until_primed():
+    # Arrange
+    cache = ProductCache(ttl=0)
+    warmup = Warmup(
+        sessions=0, categories=["Apparel"], max_idle=0, retry_delay=0
+    )
+    with (
+        patch("src.execute.warmup.ExecuteService") as mock_service,
+        patch("src.execute.warmup.PRODUCT_CACHE", cache),
+    ):
+        mock_service.return_value.run = AsyncMock(
+            side_effect=[
+                RuntimeError("no_worker_available"),
+                [],
+                [product()],
+            ]
+        )
+
+        # Act
+        await warmup.run()
+        primed = warmup.cache_primed()
+
+    # Assert
+    assert primed
+    assert warmup.state.done
+    assert warmup.state.errors == {}
+    assert mock_service.return_value.run.await_count == PRIME_ATTEMPTS
+
+
+@pytest.mark.asyncio
+async def test_failed_sessions_are_reopened_until_warm():
+    # Arrange
+    pool = SessionPool(max_idle=POOL_SIZE)
+    warmup = Warmup(
+        sessions=WARM_SESSIONS,
+        categories=[],
+        max_idle=POOL_SIZE,
+        retry_delay=0,
+    )
+    hub_down = MagicMock()
+    hub_down.warm_up.side_effect = ConnectionError("hub unreachable")
+    sessions = iter([hub_down, MagicMock(), MagicMock()])
+    with (
+        patch("src.builder.sessions.get_session_pool", return_value=pool),
+        patch("src.builder.sessions.PageObject") as mock_page_object,
+    ):
+        mock_page_object.side_effect = lambda category: next(sessions)
+
+        # Act
+        await warmup.run()
+        ready = warmup.sessions_ready()
+
+    # Assert
+    assert ready
+    assert pool.size() == WARM_SESSIONS
+    hub_down.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_recycled_sessions_are_not_ready():
+    # Arrange
+    pool = SessionPool(max_idle=POOL_SIZE)
+    warmup = Warmup(sessions=WARM_SESSIONS, categories=[], max_idle=POOL_SIZE)
+    with (
+        patch("src.builder.sessions.get_session_pool", return_value=pool),
+        patch("src.builder.sessions.PageObject") as mock_page_object,
+    ):
+        mock_page_object.side_effect = lambda category: MagicMock()
+        await warmup.run()
+        in_use = pool.acquire("Apparel")
+
+        # Act
+        pool.watchdog.recycle(pool.idle.pop(), "age")
+        degraded = warmup.sessions_ready()
+        pool.release(in_use)
+        still_degraded = warmup.sessions_ready()
+
+    # Assert
+    assert not degraded
+    assert not still_degraded
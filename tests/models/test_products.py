@@ -1,6 +1,8 @@
 # tests/models/test_products.py
 
-from src.models.product import Product
+import json
+
+from src.models.product import Product, dump_products
 
 PRICE = 9.99
 STOCK_QUANTITY = 10
@@ -24,3 +26,16 @@ def test_product_model():
     assert product.stock_status == "In Stock"
     assert product.stock_quantity == STOCK_QUANTITY
     assert product.total == TOTAL
+
+
+def test_dump_products_matches_model_dump():
+    product = Product(
+        title="Test Product",
+        price=9.99,
+        link="https://example.com/product",
+        stock_status="In Stock",
+        stock_quantity=10,
+        total=100,
+    )
+
+    assert json.loads(dump_products([product])) == [product.model_dump()]
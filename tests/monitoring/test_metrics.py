@@ -0,0 +1,34 @@
+# tests/monitoring/test_metrics.py
+
+from src.monitoring.metrics import Metrics
+
+IDLE_SESSIONS = 3
+AGE_RECYCLES = 2
+
+
+def test_counters_are_labelled_and_rendered():
+    # Arrange
+    metrics = Metrics()
+    metrics.describe("recycles_total", "Sessions recycled.")
+
+    # Act
+    metrics.inc("recycles_total", reason="age")
+    metrics.inc("recycles_total", reason="age")
+    metrics.inc("recycles_total", reason="memory")
+    text = metrics.render()
+
+    # Assert
+    assert metrics.value("recycles_total", reason="age") == AGE_RECYCLES
+    assert "# TYPE recycles_total counter" in text
+    assert 'recycles_total{reason="age"} 2' in text
+    assert 'recycles_total{reason="memory"} 1' in text
+
+
+def test_gauges_are_read_when_rendered():
+    metrics = Metrics()
+    metrics.gauge("sessions_idle", lambda: IDLE_SESSIONS, "Idle sessions.")
+
+    text = metrics.render()
+
+    assert "# TYPE sessions_idle gauge" in text
+    assert f"sessions_idle {IDLE_SESSIONS}" in text
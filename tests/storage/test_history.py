@@ -0,0 +1,153 @@
+# tests/storage/test_history.py
+
+from datetime import datetime, timezone
+
+from src.models.product import Product
+from src.storage.history import (
+    CHUNK_SIZE,
+    STRING_RECORD,
+    HistoryStore,
+    RunLengthColumn,
+)
+
+LINK = "https://example.com/product"
+START = 1_700_000_000
+OBSERVATIONS = 3 * CHUNK_SIZE + 10
+INTERVAL = 100
+RUNS = 2
+# Kind byte of the record after the category string.
+CORRUPT_OFFSET = STRING_RECORD.size + len("Apparel")
+
+
+def make_product(price: float, quantity: int, link: str = LINK):
+    return Product(
+        title="Test Product",
+        price=price,
+        link=link,
+        stock_status="In Stock" if quantity else "Out of Stock",
+        stock_quantity=quantity,
+        total=1,
+    )
+
+
+def at(seconds: int) -> datetime:
+    return datetime.fromtimestamp(START + seconds, tz=timezone.utc)
+
+
+def test_run_length_column_stores_runs_once():
+    column = RunLengthColumn("d")
+    for value in [1.0, 1.0, 1.0, 2.0, 2.0, 1.0]:
+        column.append(value)
+
+    assert len(column.values) == RUNS + 1
+    assert list(column.slice(2, 5)) == [1.0, 2.0, 2.0]
+
+
+def test_product_history_range_across_chunks():
+    store = HistoryStore()
+    for second in range(OBSERVATIONS):
+        price = 10.0 if second < CHUNK_SIZE else 12.0
+        store.record("Apparel", [make_product(price, 5)], START + second)
+
+    history = store.product_history(
+        LINK, start=at(CHUNK_SIZE - 1), end=at(CHUNK_SIZE + 1)
+    )
+
+    assert [o.price for o in history.observations] == [10.0, 12.0, 12.0]
+    assert history.observations[0].scraped_at == at(CHUNK_SIZE - 1)
+    assert len(store.series[LINK].chunks) == OBSERVATIONS // CHUNK_SIZE + 1
+
+
+def test_product_history_downsamples_to_last_per_interval():
+    store = HistoryStore()
+    for second in range(INTERVAL * 3):
+        store.record("Apparel", [make_product(second, 1)], START + second)
+
+    history = store.product_history(LINK, interval=INTERVAL)
+
+    assert [o.price for o in history.observations] == [99.0, 199.0, 299.0]
+
+
+def test_unknown_product_has_no_history():
+    assert HistoryStore().product_history(LINK) is None
+
+
+def test_category_history_and_duplicate_rows():
+    store = HistoryStore()
+    other = "https://example.com/other"
+    store.record(
+        "Cosmetics",
+        [
+            make_product(1.0, 0),
+            make_product(1.0, 0),
+            make_product(2.0, 3, other),
+        ],
+        START,
+    )
+
+    histories = store.category_history("Cosmetics")
+
+    assert [h.link for h in histories] == [other, LINK]
+    assert len(histories[1].observations) == 1
+    assert histories[1].observations[0].stock_status == "Out of Stock"
+    assert store.category_history("Apparel") == []
+
+
+def test_history_log_is_replayed(tmp_path):
+    path = str(tmp_path / "history.bin")
+    store = HistoryStore(path=path)
+    store.record("Apparel", [make_product(5.0, 2)], START)
+    store.record("Apparel", [make_product(6.0, 0)], START + 1)
+    store.close()
+
+    replayed = HistoryStore(path=path)
+    replayed.record("Apparel", [make_product(7.0, 1)], START + 2)
+    replayed.close()
+
+    history = HistoryStore(path=path).product_history(LINK)
+    assert [o.price for o in history.observations] == [5.0, 6.0, 7.0]
+    assert [o.stock_quantity for o in history.observations] == [2, 0, 1]
+
+
+def test_truncated_log_tail_is_dropped(tmp_path):
+    # Arrange: a crash mid-write leaves half a record behind.
+    path = tmp_path / "history.bin"
+    store = HistoryStore(path=str(path))
+    store.record("Apparel", [make_product(5.0, 2)], START)
+    store.record("Apparel", [make_product(6.0, 1)], START + 1)
+    store.close()
+    path.write_bytes(path.read_bytes()[:-5])
+
+    # Act
+    replayed = HistoryStore(path=str(path))
+    replayed.record("Apparel", [make_product(7.0, 1)], START + 2)
+    replayed.close()
+
+    # Assert
+    history = HistoryStore(path=str(path)).product_history(LINK)
+    assert [o.price for o in history.observations] == [5.0, 7.0]
+
+
+def test_corrupt_log_is_moved_aside(tmp_path):
+    # Arrange: one damaged byte in the middle, not a partial write.
+    path = tmp_path / "history.bin"
+    store = HistoryStore(path=str(path))
+    store.record("Apparel", [make_product(5.0, 2)], START)
+    store.record("Apparel", [make_product(6.0, 1)], START + 1)
+    store.close()
+    original = path.read_bytes()
+    damaged = bytearray(original)
+    damaged[CORRUPT_OFFSET] = ord("X")
+    path.write_bytes(bytes(damaged))
+
+    # Act
+    replayed = HistoryStore(path=str(path))
+    replayed.record("Apparel", [make_product(7.0, 1)], START + 2)
+    replayed.close()
+
+    # Assert
+    [aside] = tmp_path.glob("history.bin.corrupt-*")
+    assert aside.read_bytes() == bytes(damaged)
+    assert len(aside.read_bytes()) == len(original)
+    history = HistoryStore(path=str(path)).product_history(LINK)
+    assert [o.price for o in history.observations] == [7.0]
@@ -0,0 +1,56 @@
+# tests/storage/test_reparse.py
+
+import json
+
+from src.storage.reparse import main, reparse
+from src.storage.snapshot import SnapshotStore
+from tests.storage.test_snapshot import EXPECTED, PAGE_URL, TABLE
+
+CAPTURES = 3
+PRODUCTS_PER_TABLE = 2
+
+
+def test_reparse_parses_each_snapshot_once(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    for _ in range(CAPTURES):
+        store.save("Apparel", TABLE, EXPECTED)
+
+    results = list(reparse(store, workers=2))
+
+    assert len(results) == CAPTURES
+    assert all(len(products) == PRODUCTS_PER_TABLE for _, products in results)
+    assert results[0][1] is results[1][1]
+
+
+def test_main_writes_ndjson(tmp_path, capsys):
+    store = SnapshotStore(str(tmp_path))
+    digest = store.save("Apparel", TABLE, EXPECTED)
+    store.save("Cosmetics", TABLE, EXPECTED)
+
+    main([str(tmp_path), "--category", "Apparel", "--workers", "1"])
+
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(rows) == PRODUCTS_PER_TABLE
+    assert rows[0]["hash"] == digest
+    assert rows[0]["title"] == "Cotton Shirt"
+
+
+def test_reparse_skips_captures_of_other_sites(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save("Apparel", TABLE, EXPECTED)
+    store.save("Apparel", TABLE, EXPECTED, site="other")
+
+    results = list(reparse(store, workers=1))
+
+    assert [entry["site"] for entry, _ in results] == ["default"]
+
+
+def test_reparse_resolves_links_against_the_captured_page(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    table = TABLE.replace("https://example.com/1", "/product/1")
+    store.save("Apparel", table, EXPECTED, page_url=PAGE_URL)
+
+    [(entry, products)] = list(reparse(store, workers=1))
+
+    assert entry["page_url"] == PAGE_URL
+    assert products[0].link == "https://example.com/product/1"
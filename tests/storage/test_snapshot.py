@@ -0,0 +1,67 @@
+# tests/storage/test_snapshot.py
+
+import os
+
+from src.storage.snapshot import SnapshotStore, parse_snapshot
+
+TABLE = """
+<tbody id="product-tbody">
+  <tr>
+    <td>1</td><td> Cotton
+      Shirt</td><td>Apparel</td><td>$19.99</td><td>In Stock (5)</td>
+    <td><a class="btn view-details-btn" href="https://example.com/1">
+      View</a></td>
+  </tr>
+  <tr>
+    <td>2</td><td>Lipstick</td><td>Cosmetics</td><td>$5.00</td>
+    <td>Out of Stock</td><td></td>
+  </tr>
+  <tr><td>broken</td></tr>
+</tbody>
+"""
+EXPECTED = 3
+PRICE = 19.99
+DISTINCT_TABLES = 2
+PAGE_URL = "https://example.com/shop/"
+
+
+def test_parse_snapshot_applies_scraper_rules():
+    products = parse_snapshot(TABLE, EXPECTED)
+
+    assert [product.title for product in products] == [
+        "Cotton Shirt",
+        "Lipstick",
+    ]
+    assert products[0].price == PRICE
+    assert products[0].link == "https://example.com/1"
+    assert products[1].link == ""
+    assert products[1].stock_status == "Out of Stock"
+    assert all(product.total == EXPECTED for product in products)
+
+
+def test_save_is_content_addressed(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+
+    first = store.save("Apparel", TABLE, EXPECTED)
+    second = store.save("Apparel", TABLE, EXPECTED)
+    store.save("Cosmetics", "<tbody></tbody>", 0)
+
+    assert first == second
+    objects = [
+        name for _, _, names in os.walk(tmp_path / "objects") for name in names
+    ]
+    assert len(objects) == DISTINCT_TABLES
+    assert [entry["hash"] for entry in store.entries("Apparel")] == [
+        first,
+        first,
+    ]
+    assert store.load(first) == TABLE
+
+
+def test_parse_snapshot_resolves_relative_links():
+    table = TABLE.replace("https://example.com/1", "/product/1")
+
+    products = parse_snapshot(table, EXPECTED, PAGE_URL)
+
+    assert products[0].link == "https://example.com/product/1"
+    assert products[1].link == ""